@@ -1,57 +1,105 @@
 #!/usr/bin/env python3
 """
 Browser History Extractor
-Directly extracts Chrome browser history from SQLite database and saves to JSON file.
+Directly extracts Chrome browser history from SQLite database and saves to a JSONL file.
 """
 
 import os
+import platform
 import shutil
 import sqlite3
 import sys
 import tempfile
-from datetime import datetime, timezone
+from contextlib import closing, contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
 
 # Add the parent directory to Python path to enable imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from databases.helpers import get_supabase_client, save_data_to_json
+from databases.helpers import get_supabase_client, save_data_to_jsonl
+
+# Microseconds between the Chrome epoch (1601-01-01) and the Unix epoch (1970-01-01)
+CHROME_EPOCH_OFFSET_MICROSECONDS = 11644473600 * 1000000
+
+# Number of history rows pulled from SQLite per fetch
+HISTORY_FETCH_SIZE = 10000
+
+# Keys of each extracted history entry, in query column order
+_HISTORY_KEYS = ("url", "title", "visit_count", "timestamp")
+
+# Chrome's default-profile History database per operating system, resolved at import
+_SYSTEM = platform.system()
+_CHROME_HISTORY_PATH = {
+    "Darwin": os.path.expanduser(
+        "~/Library/Application Support/Google/Chrome/Default/History"
+    ),
+    "Windows": os.path.expanduser(
+        "~\\AppData\\Local\\Google\\Chrome\\User Data\\Default\\History"
+    ),
+    "Linux": os.path.expanduser("~/.config/google-chrome/Default/History"),
+}.get(_SYSTEM)
 
 
 def get_chrome_history_path():
     """
     Get the path to Chrome's history database based on the operating system.
     """
-    import platform
+    if _CHROME_HISTORY_PATH is None:
+        raise OSError(f"Unsupported operating system: {_SYSTEM}")
+    return _CHROME_HISTORY_PATH
 
-    system = platform.system()
 
-    if system == "Darwin":  # macOS
-        return os.path.expanduser(
-            "~/Library/Application Support/Google/Chrome/Default/History"
-        )
-    elif system == "Windows":
-        return os.path.expanduser(
-            "~\\AppData\\Local\\Google\\Chrome\\User Data\\Default\\History"
-        )
-    elif system == "Linux":
-        return os.path.expanduser("~/.config/google-chrome/Default/History")
-    else:
-        raise OSError(f"Unsupported operating system: {system}")
+def chrome_is_writing(history_path: str) -> bool:
+    """
+    Check whether Chrome has uncommitted changes to its History database.
+    A non-empty -wal or -journal file next to it means the main file alone is not
+    the current state of the database.
+    """
+    for suffix in ("-wal", "-journal"):
+        sidecar_path = history_path + suffix
+        if os.path.exists(sidecar_path) and os.path.getsize(sidecar_path) > 0:
+            return True
+    return False
 
 
-def chrome_time_to_datetime(chrome_time):
+@contextmanager
+def open_chrome_history(history_path: str):
     """
-    Convert Chrome timestamp to Python datetime.
-    Chrome uses microseconds since January 1, 1601 UTC.
+    Open Chrome's History database for reading, closing it on exit.
+
+    When Chrome isn't holding the database, the file is opened in immutable mode:
+    SQLite takes no locks and reads it in place. Otherwise Chrome may hold an
+    exclusive lock that any SQLite reader would wait on, so the file is copied
+    to a temporary directory and the copy is read instead.
     """
-    if chrome_time == 0:
-        return None
+    if not chrome_is_writing(history_path):
+        history_uri = f"{Path(history_path).as_uri()}?mode=ro&immutable=1"
+        with closing(sqlite3.connect(history_uri, uri=True)) as conn:
+            yield conn
+        return
 
-    # Chrome epoch starts at January 1, 1601
-    # Unix epoch starts at January 1, 1970
-    # Difference is 11644473600 seconds
-    unix_timestamp = (chrome_time / 1000000) - 11644473600
-    return datetime.fromtimestamp(unix_timestamp, tz=timezone.utc)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = os.path.join(temp_dir, "History")
+        shutil.copy2(history_path, temp_path)
+        with closing(sqlite3.connect(temp_path)) as conn:
+            yield conn
+
+
+def chrome_times_to_iso(chrome_times) -> list[str]:
+    """
+    Convert a sequence of Chrome timestamps to ISO-8601 UTC strings.
+    Chrome uses microseconds since January 1, 1601 UTC.
+    """
+    # Shift to the Unix epoch on an int64 array, then format the whole batch in C
+    unix_microseconds = (
+        np.asarray(chrome_times, dtype=np.int64) - CHROME_EPOCH_OFFSET_MICROSECONDS
+    )
+    return np.datetime_as_string(
+        unix_microseconds.astype("datetime64[us]"), unit="us", timezone="UTC"
+    ).tolist()
 
 
 def save_browser_history_to_supabase(supabase_client, history_entries: list):
@@ -98,56 +146,56 @@ def extract_chrome_history():
 
     print(f"Found Chrome history database: {history_path}")
 
-    # Create a temporary copy since Chrome locks the database
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".db") as temp_file:
-        temp_path = temp_file.name
+    with open_chrome_history(history_path) as conn:
+        cursor = conn.cursor()
 
-    shutil.copy2(history_path, temp_path)
+        # Query to get browsing history
+        query = """
+        SELECT urls.url, urls.title, urls.visit_count, urls.last_visit_time
+        FROM urls
+        WHERE urls.last_visit_time > 0
+        ORDER BY urls.last_visit_time DESC
+        """
 
-    # Connect to the copied database
-    conn = sqlite3.connect(temp_path)
-    cursor = conn.cursor()
+        cursor.execute(query)
 
-    # Query to get browsing history
-    query = """
-    SELECT urls.url, urls.title, urls.visit_count, urls.last_visit_time
-    FROM urls
-    WHERE urls.last_visit_time > 0
-    ORDER BY urls.last_visit_time DESC
-    """
+        # Stream rows in chunks rather than materializing the full result set
+        history_entries = []
+        while True:
+            rows = cursor.fetchmany(HISTORY_FETCH_SIZE)
+            if not rows:
+                break
 
-    cursor.execute(query)
-    results = cursor.fetchall()
+            urls, titles, visit_counts, last_visit_times = zip(*rows)
 
-    print(f"Found {len(results)} history entries")
+            # Convert the chunk's Chrome timestamps in one vectorized pass
+            timestamps = chrome_times_to_iso(last_visit_times)
 
-    # Convert to structured data
-    history_entries = []
-    for url, title, visit_count, last_visit_time in results:
-        # Convert timestamp safely
-        timestamp_dt = (
-            chrome_time_to_datetime(last_visit_time) if last_visit_time else None
-        )
+            # Many visits share a page title; intern so repeats share one object
+            titles = [sys.intern(title) if title else "" for title in titles]
 
-        entry = {
-            "url": url,
-            "title": title or "",
-            "visit_count": visit_count,
-            "timestamp": timestamp_dt.isoformat() if timestamp_dt else None,
-        }
-        history_entries.append(entry)
-
-    conn.close()
+            # Convert to structured data, growing the list once per chunk
+            history_entries.extend(
+                dict(zip(_HISTORY_KEYS, row))
+                for row in zip(urls, titles, visit_counts, timestamps)
+            )
 
-    # Clean up temporary file
-    if os.path.exists(temp_path):
-        os.unlink(temp_path)
+    print(f"Found {len(history_entries)} history entries")
 
     return history_entries
 
 
+def history_metadata(history_entries: list) -> dict:
+    """Build the header line written at the top of a history JSONL export."""
+    return {
+        "extraction_date": datetime.now().isoformat(),
+        "browser": "Google Chrome",
+        "total_entries": len(history_entries),
+    }
+
+
 def save_browser_history_data(history_entries: list):
-    """Save browser history data to Supabase if configured, otherwise save to JSON."""
+    """Save browser history data to Supabase if configured, otherwise save to JSONL."""
     supabase_client = get_supabase_client("browser_history")
 
     if supabase_client:
@@ -158,18 +206,27 @@ def save_browser_history_data(history_entries: list):
                 f"✅ Successfully saved {len(result.data)} history entries to Supabase"
             )
         else:
-            print("❌ Failed to save to Supabase, falling back to JSON...")
-            save_data_to_json(
-                history_entries, "chrome_history", "browser_history/data", "failed_"
+            print("❌ Failed to save to Supabase, falling back to JSONL...")
+            save_data_to_jsonl(
+                history_entries,
+                "chrome_history",
+                "browser_history/data",
+                "failed_",
+                metadata=history_metadata(history_entries),
             )
     else:
-        print("Supabase not configured, saving to JSON...")
-        save_data_to_json(history_entries, "chrome_history", "browser_history/data")
+        print("Supabase not configured, saving to JSONL...")
+        save_data_to_jsonl(
+            history_entries,
+            "chrome_history",
+            "browser_history/data",
+            metadata=history_metadata(history_entries),
+        )
 
 
 def save_browser_history():
     """
-    Extract Chrome browser history and save to JSON file.
+    Extract Chrome browser history and save to Supabase or a JSONL file.
     """
     print("Extracting Chrome browser history...")
 
@@ -21,6 +21,31 @@ from databases.helpers import get_supabase_client, save_data_to_json
 # Calendar API scope for reading calendar events
 SCOPES = ["https://www.googleapis.com/auth/calendar.readonly"]
 
+# Calendar API keys read by extract_event_data
+_EVENT_API_KEYS = (
+    "id",
+    "status",
+    "created",
+    "updated",
+    "summary",
+    "description",
+    "location",
+    "creator",
+    "organizer",
+    "start",
+    "end",
+    "attendees",
+    "recurrence",
+    "htmlLink",
+    "eventType",
+)
+
+# Partial-response mask so the API only returns what extract_event_data reads
+_EVENT_LIST_FIELDS = "items(" + ",".join(_EVENT_API_KEYS) + "),nextPageToken"
+
+# Largest page size the Calendar API accepts for events().list
+MAX_EVENTS_PER_PAGE = 2500
+
 
 def authenticate_calendar():
     """Authenticate and return Calendar service object."""
@@ -129,21 +154,29 @@ def get_recent_events(count=10, days_back=30):
 
     print(f"Retrieving events from the last {days_back} days...")
 
-    # Get events from primary calendar
-    events_result = (
-        service.events()
-        .list(
+    # Get events from primary calendar, following pages until count is reached
+    # Pages are chained through nextPageToken, so each request depends on the
+    # previous response and they cannot be dispatched as one batch
+    events_resource = service.events()
+    events = []
+    page_token = None
+    while len(events) < count:
+        events_result = events_resource.list(
             calendarId="primary",
             timeMin=start_time,
             timeMax=end_time,
-            maxResults=count,
+            maxResults=min(count - len(events), MAX_EVENTS_PER_PAGE),
             singleEvents=True,
             orderBy="startTime",
-        )
-        .execute()
-    )
+            fields=_EVENT_LIST_FIELDS,
+            pageToken=page_token,
+        ).execute()
+
+        events.extend(events_result.get("items", []))
 
-    events = events_result.get("items", [])
+        page_token = events_result.get("nextPageToken")
+        if not page_token:
+            break
 
     if not events:
         print("No events found.")
@@ -153,6 +186,9 @@ def get_recent_events(count=10, days_back=30):
 
     all_events = []
 
+    # One batch, one logical save time shared by every event in it
+    saved_at = datetime.now().isoformat()
+
     # Process each event
     for i, event in enumerate(events, 1):
         print(f"Processing event {i}/{len(events)} (ID: {event.get('id', 'Unknown')})")
@@ -160,20 +196,17 @@ def get_recent_events(count=10, days_back=30):
         # Extract full event data
         event_data = extract_event_data(event)
 
-        if event_data:
-            # Add timestamp for when this was saved
-            event_data["saved_at"] = datetime.now().isoformat()
-            all_events.append(event_data)
+        # Add timestamp for when this was saved
+        event_data["saved_at"] = saved_at
+        all_events.append(event_data)
 
-            # Get start time for display
-            start = event.get("start", {})
-            start_time_str = start.get("dateTime", start.get("date", "Unknown time"))
+        # Get start time for display
+        start = event_data["start"]
+        start_time_str = start.get("dateTime", start.get("date", "Unknown time"))
 
-            print(f"  Title: {event_data['summary']}")
-            print(f"  Start: {start_time_str}")
-            print(f"  Location: {event_data['location'] or 'No location'}")
-        else:
-            print(f"  Failed to retrieve event data for event {i}")
+        print(f"  Title: {event_data['summary']}")
+        print(f"  Start: {start_time_str}")
+        print(f"  Location: {event_data['location'] or 'No location'}")
 
     return all_events
 
@@ -1,7 +1,8 @@
-import json
 import os
 from datetime import datetime
 
+import orjson
+
 # Supabase imports with availability check
 try:
     from supabase import Client, create_client
@@ -12,6 +13,9 @@ except ImportError:
     Client = None
     create_client = None
 
+# Write buffer for data exports; large enough that most files flush in one go
+WRITE_BUFFER_SIZE = 1 << 20
+
 
 def is_supabase_available():
     """Check if Supabase is available."""
@@ -75,8 +79,49 @@ def save_data_to_json(
     # Create data directory if it doesn't exist
     os.makedirs(data_dir, exist_ok=True)
 
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # orjson encodes straight to UTF-8 bytes, so the file is written in one call.
+    # Non-str dict keys are stringified as json did; unlike json, NaN and
+    # infinities are written as null, and datetimes as ISO-8601 strings
+    data_bytes = orjson.dumps(
+        data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+    )
+    with open(filename, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(data_bytes)
+
+    print(f"📁 {len(data)} records saved to {filename}")
+    return filename
+
+
+def save_data_to_jsonl(
+    data: list,
+    filename_prefix: str = "data",
+    data_dir: str = "data",
+    file_prefix: str = "",
+    metadata: dict | None = None,
+):
+    """Save data to a JSON Lines file (one record per line) with timestamp.
+
+    Args:
+        data: List of data to save
+        filename_prefix: Prefix for the filename
+        data_dir: Directory to save the file in
+        file_prefix: Additional prefix for the filename (e.g., "failed_")
+        metadata: Optional dict written as the first line of the file
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = (
+        f"{data_dir}/{file_prefix}{filename_prefix}_{len(data)}_{timestamp}.jsonl"
+    )
+
+    # Create data directory if it doesn't exist
+    os.makedirs(data_dir, exist_ok=True)
+
+    with open(filename, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        if metadata is not None:
+            f.write(orjson.dumps(metadata, option=orjson.OPT_APPEND_NEWLINE))
+        f.writelines(
+            orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE) for record in data
+        )
 
     print(f"📁 {len(data)} records saved to {filename}")
     return filename
@@ -33,6 +33,9 @@ class SupabaseSetup:
             self._whatsapp_messages_table(),
             self._screen_activity_table(),
             self._location_history_table(),
+            self._imessages_by_day_view(),
+            self._whatsapp_messages_by_day_view(),
+            self._browser_history_daily_sites_view(),
         ]
 
         print("Creating Supabase tables...")
@@ -208,6 +211,43 @@ class SupabaseSetup:
         CREATE INDEX IF NOT EXISTS idx_location_history_source ON location_history(source);
         """
 
+    def _imessages_by_day_view(self) -> str:
+        """SQL for iMessages view with each message's calendar day precomputed."""
+        return """
+        -- service holds 'YYYY-MM-DD HH:MM:SS' text; its date prefix is the day
+        CREATE OR REPLACE VIEW imessages_by_day AS
+        SELECT id, text, contact, is_from_me, service, LEFT(service, 10) AS day
+        FROM imessages;
+        """
+
+    def _whatsapp_messages_by_day_view(self) -> str:
+        """SQL for WhatsApp messages view with each message's UTC day precomputed."""
+        return """
+        CREATE OR REPLACE VIEW whatsapp_messages_by_day AS
+        SELECT id, text, timestamp, from_name, chat_name,
+            (timestamp AT TIME ZONE 'UTC')::date AS day
+        FROM whatsapp_messages;
+        """
+
+    def _browser_history_daily_sites_view(self) -> str:
+        """SQL for browser history view collapsed to one row per UTC day and site."""
+        return """
+        -- site is the URL's scheme and host (the whole URL if it has no "://"),
+        -- so every URL in a group shares one domain
+        CREATE OR REPLACE VIEW browser_history_daily_sites AS
+        SELECT day, site,
+            (ARRAY_AGG(url ORDER BY timestamp, id))[1] AS example_url,
+            COUNT(*) AS visits
+        FROM (
+            SELECT id, url, timestamp,
+                (timestamp AT TIME ZONE 'UTC')::date AS day,
+                COALESCE(SUBSTRING(url FROM '^[A-Za-z][A-Za-z0-9+.-]*://[^/?#]*'), url) AS site
+            FROM browser_history
+            WHERE url <> '' AND timestamp IS NOT NULL
+        ) AS visits
+        GROUP BY day, site;
+        """
+
     def get_table_schemas(self) -> Dict[str, str]:
         """Return dictionary of table names and their SQL schemas."""
         return {
@@ -218,6 +258,9 @@ class SupabaseSetup:
             "whatsapp_messages": self._whatsapp_messages_table(),
             "screen_activity": self._screen_activity_table(),
             "location_history": self._location_history_table(),
+            "imessages_by_day": self._imessages_by_day_view(),
+            "whatsapp_messages_by_day": self._whatsapp_messages_by_day_view(),
+            "browser_history_daily_sites": self._browser_history_daily_sites_view(),
         }
 
 
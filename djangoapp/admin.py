@@ -1,4 +1,6 @@
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.db.models.functions import Length, Substr
 
 from .models import (
     Day,
@@ -10,6 +12,102 @@ from .models import (
     WebsiteAnalysis,
 )
 
+# Columns TimeAnalysis.__str__ needs when rendered as a changelist FK column
+TIME_ANALYSIS_LABEL_FIELDS = (
+    "time_analysis__name",
+    "time_analysis__start_date",
+    "time_analysis__end_date",
+)
+
+
+def time_analysis_choices():
+    """Return (id, label) pairs for every TimeAnalysis, loading only the label fields."""
+    return [
+        (str(analysis.pk), str(analysis))
+        for analysis in TimeAnalysis.objects.only("name", "start_date", "end_date")
+    ]
+
+
+class TimeAnalysisFilter(admin.SimpleListFilter):
+    """Filter by time analysis with one lightweight choices query per page."""
+
+    title = "time analysis"
+
+    # Named after the relation path so ModelAdmin.lookup_allowed accepts it
+    parameter_name = "time_analysis"
+
+    def lookups(self, request, model_admin):
+        return time_analysis_choices()
+
+    def queryset(self, request, queryset):
+        if not self.value():
+            return queryset
+        try:
+            return queryset.filter(**{f"{self.parameter_name}_id": self.value()})
+        except ValueError as e:
+            raise IncorrectLookupParameters(e)
+
+
+class DayTimeAnalysisFilter(TimeAnalysisFilter):
+    """TimeAnalysisFilter for models that reach their analysis through a day."""
+
+    parameter_name = "day__time_analysis"
+
+
+class CorrelationBucketFilter(admin.SimpleListFilter):
+    """Filter correlations by the same bands get_correlation_label uses."""
+
+    title = "impact"
+    parameter_name = "impact"
+
+    # (lookup value, label, lower bound, upper bound); None means unbounded
+    BUCKETS = (
+        ("vp", "Very Positive", 0.5, None),
+        ("p", "Positive", 0.2, 0.5),
+        ("n", "Neutral", -0.2, 0.2),
+        ("neg", "Negative", -0.5, -0.2),
+        ("vn", "Very Negative", None, -0.5),
+    )
+
+    def lookups(self, request, model_admin):
+        return [(value, label) for value, label, _, _ in self.BUCKETS]
+
+    def queryset(self, request, queryset):
+        for value, _, lower, upper in self.BUCKETS:
+            if self.value() == value:
+                if lower is not None:
+                    queryset = queryset.filter(correlation_coefficient__gte=lower)
+                if upper is not None:
+                    queryset = queryset.filter(correlation_coefficient__lt=upper)
+                return queryset
+        return queryset
+
+
+class SignificanceBucketFilter(admin.SimpleListFilter):
+    """Filter correlations into coarse significance score ranges."""
+
+    title = "significance"
+    parameter_name = "significance"
+
+    BUCKETS = (
+        ("high", "High (≥ 1.0)", 1.0, None),
+        ("medium", "Medium (0.3 – 1.0)", 0.3, 1.0),
+        ("low", "Low (< 0.3)", None, 0.3),
+    )
+
+    def lookups(self, request, model_admin):
+        return [(value, label) for value, label, _, _ in self.BUCKETS]
+
+    def queryset(self, request, queryset):
+        for value, _, lower, upper in self.BUCKETS:
+            if self.value() == value:
+                if lower is not None:
+                    queryset = queryset.filter(significance_score__gte=lower)
+                if upper is not None:
+                    queryset = queryset.filter(significance_score__lt=upper)
+                return queryset
+        return queryset
+
 
 @admin.register(TimeAnalysis)
 class TimeAnalysisAdmin(admin.ModelAdmin):
@@ -30,6 +128,14 @@ class TimeAnalysisAdmin(admin.ModelAdmin):
         ),
     )
 
+    def get_queryset(self, request):
+        """Optimize queryset by loading only listed columns."""
+        return (
+            super()
+            .get_queryset(request)
+            .only("name", "start_date", "end_date", "status", "created_at")
+        )
+
 
 @admin.register(Day)
 class DayAdmin(admin.ModelAdmin):
@@ -43,11 +149,12 @@ class DayAdmin(admin.ModelAdmin):
         "message_count",
         "created_at",
     )
-    list_filter = ("time_analysis", "created_at")
+    list_filter = (TimeAnalysisFilter, "created_at")
     search_fields = ("time_analysis__name",)
     readonly_fields = ("sentiment_label", "created_at")
     date_hierarchy = "date"
     ordering = ("-date",)
+    show_full_result_count = False
 
     fieldsets = (
         (
@@ -66,8 +173,19 @@ class DayAdmin(admin.ModelAdmin):
     )
 
     def get_queryset(self, request):
-        """Optimize queryset with select_related."""
-        return super().get_queryset(request).select_related("time_analysis")
+        """Optimize queryset with select_related, loading only listed columns."""
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("time_analysis")
+            .only(
+                "date",
+                "sentiment",
+                "message_count",
+                "created_at",
+                *TIME_ANALYSIS_LABEL_FIELDS,
+            )
+        )
 
 
 @admin.register(Message)
@@ -83,11 +201,12 @@ class MessageAdmin(admin.ModelAdmin):
         "day",
         "created_at",
     )
-    list_filter = ("source", "day__time_analysis", "created_at")
+    list_filter = ("source", DayTimeAnalysisFilter, "created_at")
     search_fields = ("text", "contact", "day__time_analysis__name")
     readonly_fields = ("sentiment_label", "created_at")
     date_hierarchy = "created_at"
     ordering = ("-sentiment",)
+    show_full_result_count = False
 
     fieldsets = (
         (
@@ -109,15 +228,28 @@ class MessageAdmin(admin.ModelAdmin):
 
     def get_short_text(self, obj):
         """Return truncated text for list display."""
-        if len(obj.text) > 100:
-            return obj.text[:100] + "..."
-        return obj.text
+        if obj.text_length > 100:
+            return obj.short_text + "..."
+        return obj.short_text
 
     get_short_text.short_description = "Text Preview"
 
     def get_queryset(self, request):
-        """Optimize queryset with select_related."""
-        return super().get_queryset(request).select_related("day", "day__time_analysis")
+        """Optimize queryset with select_related and a database-side text preview."""
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("day")
+            .annotate(short_text=Substr("text", 1, 100), text_length=Length("text"))
+            .only(
+                "sentiment",
+                "source",
+                "contact",
+                "created_at",
+                "day__date",
+                "day__sentiment",
+            )
+        )
 
 
 @admin.register(Location)
@@ -134,7 +266,7 @@ class LocationAdmin(admin.ModelAdmin):
         "last_visit",
         "created_at",
     )
-    list_filter = ("time_analysis", "created_at", "first_visit")
+    list_filter = (TimeAnalysisFilter, "created_at", "first_visit")
     search_fields = ("name", "address", "time_analysis__name")
     readonly_fields = ("average_time_per_visit", "coordinates", "created_at")
     date_hierarchy = "created_at"
@@ -196,8 +328,23 @@ class LocationAdmin(admin.ModelAdmin):
     coordinates.short_description = "Coordinates"
 
     def get_queryset(self, request):
-        """Optimize queryset with select_related."""
-        return super().get_queryset(request).select_related("time_analysis")
+        """Optimize queryset with select_related, loading only listed columns."""
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("time_analysis")
+            .only(
+                "name",
+                "center_latitude",
+                "center_longitude",
+                "visit_count",
+                "total_time_minutes",
+                "first_visit",
+                "last_visit",
+                "created_at",
+                *TIME_ANALYSIS_LABEL_FIELDS,
+            )
+        )
 
 
 @admin.register(WebsiteAnalysis)
@@ -216,10 +363,10 @@ class WebsiteAnalysisAdmin(admin.ModelAdmin):
         "created_at",
     )
     list_filter = (
-        "time_analysis",
+        TimeAnalysisFilter,
         "created_at",
-        "correlation_coefficient",
-        "significance_score",
+        CorrelationBucketFilter,
+        SignificanceBucketFilter,
     )
     search_fields = ("domain", "time_analysis__name", "example_url")
     readonly_fields = ("created_at",)
@@ -271,8 +418,22 @@ class WebsiteAnalysisAdmin(admin.ModelAdmin):
     get_correlation_label.admin_order_field = "correlation_coefficient"
 
     def get_queryset(self, request):
-        """Optimize queryset with select_related."""
-        return super().get_queryset(request).select_related("time_analysis")
+        """Optimize queryset with select_related, loading only listed columns."""
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("time_analysis")
+            .only(
+                "domain",
+                "correlation_coefficient",
+                "days_visited",
+                "days_not_visited",
+                "total_visits",
+                "significance_score",
+                "created_at",
+                *TIME_ANALYSIS_LABEL_FIELDS,
+            )
+        )
 
 
 @admin.register(PersonAnalysis)
@@ -292,10 +453,10 @@ class PersonAnalysisAdmin(admin.ModelAdmin):
         "created_at",
     )
     list_filter = (
-        "time_analysis",
+        TimeAnalysisFilter,
         "created_at",
-        "correlation_coefficient",
-        "significance_score",
+        CorrelationBucketFilter,
+        SignificanceBucketFilter,
     )
     search_fields = ("contact_name", "time_analysis__name")
     readonly_fields = ("created_at",)
@@ -337,8 +498,24 @@ class PersonAnalysisAdmin(admin.ModelAdmin):
     )
 
     def get_queryset(self, request):
-        """Optimize queryset with select_related."""
-        return super().get_queryset(request).select_related("time_analysis")
+        """Optimize queryset with select_related, loading only listed columns."""
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("time_analysis")
+            .only(
+                "contact_name",
+                "correlation_coefficient",
+                "days_interacted",
+                "days_not_interacted",
+                "avg_sentiment_when_interacted",
+                "avg_sentiment_when_not_interacted",
+                "total_messages",
+                "significance_score",
+                "created_at",
+                *TIME_ANALYSIS_LABEL_FIELDS,
+            )
+        )
 
 
 @admin.register(PlaceAnalysis)
@@ -358,10 +535,10 @@ class PlaceAnalysisAdmin(admin.ModelAdmin):
         "created_at",
     )
     list_filter = (
-        "time_analysis",
+        TimeAnalysisFilter,
         "created_at",
-        "correlation_coefficient",
-        "significance_score",
+        CorrelationBucketFilter,
+        SignificanceBucketFilter,
     )
     search_fields = ("location__name", "location__address", "time_analysis__name")
     readonly_fields = ("created_at",)
@@ -412,5 +589,23 @@ class PlaceAnalysisAdmin(admin.ModelAdmin):
     get_location_name.short_description = "Location"
 
     def get_queryset(self, request):
-        """Optimize queryset with select_related."""
-        return super().get_queryset(request).select_related("time_analysis", "location")
+        """Optimize queryset with select_related, loading only listed columns."""
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("time_analysis", "location")
+            .only(
+                "correlation_coefficient",
+                "days_present",
+                "days_not_present",
+                "avg_sentiment_when_present",
+                "avg_sentiment_when_not_present",
+                "total_visits",
+                "significance_score",
+                "created_at",
+                "location__name",
+                "location__center_latitude",
+                "location__center_longitude",
+                *TIME_ANALYSIS_LABEL_FIELDS,
+            )
+        )
@@ -1,4 +1,5 @@
 import django_filters
+from django_filters.rest_framework import DjangoFilterBackend
 
 from .models import Day, Message, TimeAnalysis
 
@@ -95,3 +96,20 @@ class MessageFilter(django_filters.FilterSet):
             "day_date_before",
             "time_analysis",
         ]
+
+
+class LazyDjangoFilterBackend(DjangoFilterBackend):
+    """DjangoFilterBackend that skips the filterset when no filter is requested."""
+
+    def filter_queryset(self, request, queryset, view):
+        # Plain list requests carry no query params; don't build a filterset
+        if not request.query_params:
+            return queryset
+
+        filterset_class = self.get_filterset_class(view, queryset)
+        if filterset_class is None or not any(
+            name in request.query_params for name in filterset_class.base_filters
+        ):
+            return queryset
+
+        return super().filter_queryset(request, queryset, view)
@@ -8,10 +8,10 @@ This module implements a sophisticated clustering approach that:
 """
 
 import logging
-import math
-from collections import defaultdict
-from datetime import datetime
-from typing import Dict, List
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from itertools import pairwise
 
 import numpy as np
 from dateutil.parser import parse as parse_date
@@ -19,20 +19,342 @@ from sklearn.cluster import DBSCAN
 
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_METERS = 6371000
 
-class GPSPoint:
-    """Represents a single GPS point with timestamp."""
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+# Points compared against a stay anchor per vectorized distance pass; doubles
+# while the window keeps extending so long stays take few passes
+STAY_SCAN_BLOCK_SIZE = 64
+
+# The grid cells and bounding box used to skip haversine are slightly wider
+# than the stay threshold so that anything they reject is guaranteed beyond it
+STAY_PREFILTER_MARGIN = 1.001
+
+# Longest stay a single segment may cover; a longer one is split into
+# consecutive stays, and the distance scan never looks past this window
+MAX_STAY_US = 24 * 60 * 60 * 1_000_000
+
+# Consecutive points farther apart than this many stay thresholds can never be
+# inside the same stay, so the trail may be cut between them for parallel
+# detection (two thresholds suffice; the third is a safety margin)
+STAY_SPLIT_THRESHOLDS = 3
+
+# Trails shorter than this are detected in-process; below it the worker pool
+# startup costs more than the scan itself
+PARALLEL_STAY_MIN_POINTS = 200_000
+
+
+def parse_timestamp(value: str) -> datetime:
+    """
+    Parse a GPS record timestamp.
+
+    Takes the fast datetime.fromisoformat path for ISO-8601 strings (including
+    a trailing "Z") and falls back to dateutil for anything else.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return parse_date(value)
+
+
+def _haversine_meters(lat1, lon1, cos_lat1, lat2, lon2, cos_lat2):
+    """
+    Haversine distance in meters between radian coordinates; broadcasts over
+    arrays. Takes precomputed cos(latitude) values so callers scanning the
+    same points repeatedly only pay for each cosine once.
+
+    The second point must be an array; every step after the initial
+    differences runs in place on those two buffers, so a call allocates three
+    temporaries rather than one per operation.
+    """
+    a = np.subtract(lat2, lat1)
+    a /= 2
+    np.sin(a, out=a)
+    a *= a
+
+    b = np.subtract(lon2, lon1)
+    b /= 2
+    np.sin(b, out=b)
+    b *= b
+    b *= cos_lat1 * cos_lat2
+
+    a += b
+    np.sqrt(a, out=a)
+    np.arcsin(a, out=a)
+    a *= 2 * EARTH_RADIUS_METERS
+    return a
+
+
+def _stay_grid_cells(
+    lat_rad: np.ndarray,
+    lon_rad: np.ndarray,
+    cos_lat: np.ndarray,
+    distance_threshold: float,
+) -> np.ndarray:
+    """
+    Hash each point into a grid cell about one stay threshold wide.
+
+    Points are projected equirectangularly using the smallest cos(latitude)
+    on the trail, shrunk by 2/pi (the smallest ratio of chord to arc for
+    longitude gaps up to pi), which never overstates east-west distances. Any
+    point more than one cell away from the anchor in either axis is therefore
+    certainly outside the stay threshold and needs no haversine evaluation.
+    """
+    cell_size = distance_threshold * STAY_PREFILTER_MARGIN
+
+    cell_y = np.floor(EARTH_RADIUS_METERS * lat_rad / cell_size)
+
+    # A trail spanning the antimeridian would wrap in x; hash by latitude only
+    if np.ptp(lon_rad) > np.pi:
+        cell_x = np.zeros_like(cell_y)
+    else:
+        x_scale = EARTH_RADIUS_METERS * float(cos_lat.min()) * 2 / np.pi
+        cell_x = np.floor(x_scale * lon_rad / cell_size)
+
+    return np.column_stack((cell_x, cell_y)).astype(np.int64)
+
+
+def _find_departure(
+    lat_rad: np.ndarray,
+    lon_rad: np.ndarray,
+    cos_lat: np.ndarray,
+    cells: np.ndarray,
+    i: int,
+    end: int,
+    distance_threshold: float,
+) -> int:
+    """
+    Return the index of the first point after i that lies farther than the
+    stay distance threshold from point i, or end if none before it does.
+    """
+    start = i + 1
+    block_size = STAY_SCAN_BLOCK_SIZE
+
+    # Half-width of the anchor's bounding box as an angle on the sphere
+    box_radians = distance_threshold * STAY_PREFILTER_MARGIN / EARTH_RADIUS_METERS
+
+    while start < end:
+        stop = min(start + block_size, end)
+
+        # Points outside the anchor's 3x3 cell neighbourhood are known to be
+        # beyond the threshold
+        outside_grid = np.abs(cells[start:stop] - cells[i]).max(axis=1) > 1
+
+        # So are points outside its bounding box, where the latitude gap or
+        # the longitude chord at the smaller cosine alone is too large; both are
+        # lower bounds on the haversine angle
+        dlat = np.abs(lat_rad[start:stop] - lat_rad[i])
+        dlon_chord = 2 * np.abs(np.sin((lon_rad[start:stop] - lon_rad[i]) / 2))
+        outside_box = (dlat > box_radians) | (
+            np.minimum(cos_lat[start:stop], cos_lat[i]) * dlon_chord > box_radians
+        )
+
+        # Only the points before the first rejected one need haversine
+        outside = np.flatnonzero(outside_grid | outside_box)
+        if outside.size:
+            stop = start + int(outside[0])
+
+        distances = _haversine_meters(
+            lat_rad[i],
+            lon_rad[i],
+            cos_lat[i],
+            lat_rad[start:stop],
+            lon_rad[start:stop],
+            cos_lat[start:stop],
+        )
+        beyond = np.flatnonzero(distances > distance_threshold)
+        if beyond.size:
+            return start + int(beyond[0])
+        if outside.size:
+            return stop
+
+        start = stop
+        block_size *= 2
+
+    return end
+
+
+def _detect_segments(
+    lat_rad: np.ndarray,
+    lon_rad: np.ndarray,
+    ts_us: np.ndarray,
+    distance_threshold: float,
+    time_threshold_us: int,
+) -> np.ndarray:
+    """
+    Find stay segments in a chronologically sorted trail.
+
+    Works purely on coordinate (radians) and timestamp (microseconds) arrays
+    and returns an int64 array of half-open (start, stop) index pairs, one per
+    run of at least two points that stays within the distance threshold of
+    its first point for at least the time threshold.
+    """
+    # Cosines are shared by every anchor comparison, so compute them once
+    cos_lat = np.cos(lat_rad)
+    cells = _stay_grid_cells(lat_rad, lon_rad, cos_lat, distance_threshold)
+
+    # End of each point's longest possible stay window, by binary search
+    stay_ends = np.searchsorted(ts_us, ts_us + MAX_STAY_US, side="right").tolist()
+    segments = []
+    point_count = len(lat_rad)
+    i = 0
+
+    while i < point_count:
+        # Find all consecutive points within distance threshold
+        j = _find_departure(
+            lat_rad, lon_rad, cos_lat, cells, i, stay_ends[i], distance_threshold
+        )
+
+        # At least 2 points, spanning at least the time threshold
+        if j > i + 1 and ts_us[j - 1] - ts_us[i] >= time_threshold_us:
+            segments.append((i, j))
+
+        # Move to next non-overlapping segment
+        i = max(i + 1, j)
+
+    return np.array(segments, dtype=np.int64).reshape(-1, 2)
+
+
+def _detect_segments_parallel(
+    lat_rad: np.ndarray,
+    lon_rad: np.ndarray,
+    ts_us: np.ndarray,
+    distance_threshold: float,
+    time_threshold_us: int,
+    max_workers: int,
+) -> np.ndarray:
+    """
+    Run _detect_segments over independent pieces of the trail in a process pool.
+
+    The trail is only cut where two consecutive points are several stay
+    thresholds apart. Every anchor before such a gap departs at or before it,
+    so each piece yields exactly the segments the whole trail would.
+    """
+    point_count = len(lat_rad)
+    if max_workers < 2 or point_count < PARALLEL_STAY_MIN_POINTS:
+        return _detect_segments(
+            lat_rad, lon_rad, ts_us, distance_threshold, time_threshold_us
+        )
+
+    cos_lat = np.cos(lat_rad)
+    jumps = _haversine_meters(
+        lat_rad[:-1], lon_rad[:-1], cos_lat[:-1], lat_rad[1:], lon_rad[1:], cos_lat[1:]
+    )
+    cuts = np.flatnonzero(jumps > STAY_SPLIT_THRESHOLDS * distance_threshold) + 1
+
+    # Merge neighbouring pieces into a few chunks per worker so that short
+    # sessions don't each pay for a round trip to the pool
+    min_chunk_size = point_count // (max_workers * 4)
+    bounds = [0]
+    for cut in cuts.tolist():
+        if cut - bounds[-1] >= min_chunk_size:
+            bounds.append(cut)
+    bounds.append(point_count)
+
+    if len(bounds) < 3:
+        return _detect_segments(
+            lat_rad, lon_rad, ts_us, distance_threshold, time_threshold_us
+        )
+
+    chunks = list(pairwise(bounds))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            _detect_segments,
+            [lat_rad[start:stop] for start, stop in chunks],
+            [lon_rad[start:stop] for start, stop in chunks],
+            [ts_us[start:stop] for start, stop in chunks],
+            [distance_threshold] * len(chunks),
+            [time_threshold_us] * len(chunks),
+        )
+        segments = [
+            chunk_segments + start
+            for (start, _), chunk_segments in zip(chunks, results)
+        ]
+
+    return np.concatenate(segments)
+
+
+class GPSTrail:
+    """
+    A chronologically sorted GPS trail stored as parallel arrays.
+
+    Coordinates are contiguous float64 arrays (degrees) and timestamps are kept
+    both as datetimes and as int64 microseconds, so the stay detection kernel
+    can work on the arrays directly while stay points still report datetimes.
+    """
 
     def __init__(
-        self, latitude: float, longitude: float, timestamp: datetime, **metadata
+        self,
+        latitudes: np.ndarray,
+        longitudes: np.ndarray,
+        timestamps: list[datetime],
+        metadata: list[dict],
     ):
-        self.latitude = float(latitude)
-        self.longitude = float(longitude)
-        self.timestamp = timestamp
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.timestamps = timestamps
         self.metadata = metadata
 
+        # Integer microseconds keep duration comparisons exact
+        if timestamps:
+            epoch = timestamps[0].replace(
+                year=1970, month=1, day=1, hour=0, minute=0, second=0, microsecond=0
+            )
+            self.timestamps_us = np.fromiter(
+                ((ts - epoch) // ONE_MICROSECOND for ts in timestamps),
+                dtype=np.int64,
+                count=len(timestamps),
+            )
+        else:
+            self.timestamps_us = np.empty(0, dtype=np.int64)
+
+    @classmethod
+    def from_records(cls, gps_data: list[dict]) -> "GPSTrail":
+        """Parse and validate raw GPS records into a chronologically sorted trail."""
+        latitudes = []
+        longitudes = []
+        timestamps = []
+        metadata = []
+
+        for record in gps_data:
+            if not record.get("latitude") or not record.get("longitude"):
+                continue
+
+            try:
+                timestamp = parse_timestamp(record["timestamp"])
+                latitude = float(record["latitude"])
+                longitude = float(record["longitude"])
+            except Exception as e:
+                logger.warning(f"Error parsing GPS record: {e}")
+                continue
+
+            latitudes.append(latitude)
+            longitudes.append(longitude)
+            timestamps.append(timestamp)
+            metadata.append(
+                {
+                    k: v
+                    for k, v in record.items()
+                    if k not in ["latitude", "longitude", "timestamp"]
+                }
+            )
+
+        # Sort chronologically
+        order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+
+        return cls(
+            latitudes=np.array(latitudes, dtype=np.float64)[order],
+            longitudes=np.array(longitudes, dtype=np.float64)[order],
+            timestamps=[timestamps[k] for k in order],
+            metadata=[metadata[k] for k in order],
+        )
+
+    def __len__(self):
+        return len(self.timestamps)
+
     def __repr__(self):
-        return f"GPSPoint({self.latitude}, {self.longitude}, {self.timestamp})"
+        return f"GPSTrail({len(self)} points)"
 
 
 class StayPoint:
@@ -66,7 +388,7 @@ class LocationCluster:
         self,
         center_latitude: float,
         center_longitude: float,
-        stay_points: List[StayPoint],
+        stay_points: list[StayPoint],
         name: str = "",
         address: str = "",
     ):
@@ -78,8 +400,16 @@ class LocationCluster:
 
         # Calculate statistics
         self.visit_count = len(stay_points)
-        self.total_time_minutes = sum(sp.duration_minutes for sp in stay_points)
+        self.total_time_minutes = float(
+            np.fromiter(
+                (sp.duration_minutes for sp in stay_points),
+                dtype=np.float64,
+                count=self.visit_count,
+            ).sum()
+        )
 
+        # Datetimes (possibly timezone-aware) have no native NumPy dtype, so
+        # the bounds stay on the builtin min/max
         if stay_points:
             self.first_visit = min(sp.start_time for sp in stay_points)
             self.last_visit = max(sp.end_time for sp in stay_points)
@@ -88,11 +418,11 @@ class LocationCluster:
             self.last_visit = None
 
         # Aggregate activity types from metadata
-        self.activity_types = defaultdict(int)
-        for sp in stay_points:
-            activity = sp.metadata.get("activity_type")
-            if activity:
-                self.activity_types[activity] += 1
+        self.activity_types = Counter(
+            activity
+            for activity in (sp.metadata.get("activity_type") for sp in stay_points)
+            if activity
+        )
 
     @property
     def average_time_per_visit(self) -> float:
@@ -115,6 +445,7 @@ class LocationClusterer:
         stay_time_threshold_minutes: int = 10,
         cluster_distance_threshold_meters: int = 200,
         min_cluster_visits: int = 2,
+        stay_detection_workers: int = 1,
     ):
         """
         Initialize the location clusterer.
@@ -124,13 +455,25 @@ class LocationClusterer:
             stay_time_threshold_minutes: Min time for stay point detection
             cluster_distance_threshold_meters: Max distance for clustering stay points
             min_cluster_visits: Minimum visits required to form a cluster
+            stay_detection_workers: Processes used to detect stay points on large trails
         """
         self.stay_distance_threshold = stay_distance_threshold_meters
         self.stay_time_threshold = stay_time_threshold_minutes
         self.cluster_distance_threshold = cluster_distance_threshold_meters
         self.min_cluster_visits = min_cluster_visits
+        self.stay_detection_workers = stay_detection_workers
+
+        # Haversine DBSCAN over a ball tree; the metric works on the unit sphere,
+        # so eps is the cluster distance as an angle. Built once and reused by
+        # every trail this clusterer processes.
+        self._dbscan = DBSCAN(
+            eps=cluster_distance_threshold_meters / EARTH_RADIUS_METERS,
+            min_samples=min_cluster_visits,
+            metric="haversine",
+            algorithm="ball_tree",
+        )
 
-    def process_gps_trail(self, gps_data: List[Dict]) -> List[LocationCluster]:
+    def process_gps_trail(self, gps_data: list[dict]) -> list[LocationCluster]:
         """
         Process a GPS trail into meaningful location clusters.
 
@@ -142,16 +485,16 @@ class LocationClusterer:
         """
         print(f"🔍 Processing {len(gps_data)} GPS points into location clusters...")
 
-        # Step 1: Convert to GPSPoint objects and sort chronologically
-        gps_points = self._convert_to_gps_points(gps_data)
-        if not gps_points:
+        # Step 1: Parse into a chronologically sorted trail
+        trail = GPSTrail.from_records(gps_data)
+        if not len(trail):
             print("❌ No valid GPS points to process")
             return []
 
-        print(f"📍 Converted to {len(gps_points)} GPS points")
+        print(f"📍 Converted to {len(trail)} GPS points")
 
         # Step 2: Detect stay points
-        stay_points = self._detect_stay_points(gps_points)
+        stay_points = self._detect_stay_points(trail)
         print(f"⏱️  Detected {len(stay_points)} stay points")
 
         if not stay_points:
@@ -167,35 +510,7 @@ class LocationClusterer:
 
         return clusters
 
-    def _convert_to_gps_points(self, gps_data: List[Dict]) -> List[GPSPoint]:
-        """Convert raw GPS data to GPSPoint objects."""
-        points = []
-
-        for record in gps_data:
-            if not record.get("latitude") or not record.get("longitude"):
-                continue
-
-            try:
-                timestamp = parse_date(record["timestamp"])
-                point = GPSPoint(
-                    latitude=record["latitude"],
-                    longitude=record["longitude"],
-                    timestamp=timestamp,
-                    **{
-                        k: v
-                        for k, v in record.items()
-                        if k not in ["latitude", "longitude", "timestamp"]
-                    },
-                )
-                points.append(point)
-            except Exception as e:
-                logger.warning(f"Error parsing GPS record: {e}")
-
-        # Sort chronologically
-        points.sort(key=lambda p: p.timestamp)
-        return points
-
-    def _detect_stay_points(self, gps_points: List[GPSPoint]) -> List[StayPoint]:
+    def _detect_stay_points(self, trail: GPSTrail) -> list[StayPoint]:
         """
         Detect stay points using the sliding window approach.
 
@@ -203,107 +518,89 @@ class LocationClusterer:
         for more than a minimum time threshold.
         """
         stay_points = []
-        i = 0
 
-        print(
-            f"      Detecting stay points with {self.stay_distance_threshold}m distance and {self.stay_time_threshold}min time thresholds..."
+        logger.debug(
+            "Detecting stay points with %sm distance and %smin time thresholds",
+            self.stay_distance_threshold,
+            self.stay_time_threshold,
         )
 
-        while i < len(gps_points):
-            j = i + 1
+        # The kernel stays in float64: the scan is greedy, so a point rounded
+        # across the distance threshold would move every later stay anchor
+        segments = _detect_segments_parallel(
+            np.radians(trail.latitudes),
+            np.radians(trail.longitudes),
+            trail.timestamps_us,
+            self.stay_distance_threshold,
+            self.stay_time_threshold * 60 * 1_000_000,
+            self.stay_detection_workers,
+        )
 
-            # Find all consecutive points within distance threshold
-            while j < len(gps_points):
-                distance = self._calculate_distance(
-                    gps_points[i].latitude,
-                    gps_points[i].longitude,
-                    gps_points[j].latitude,
-                    gps_points[j].longitude,
-                )
-                if distance > self.stay_distance_threshold:
-                    break
-                j += 1
-
-            # Check if time spent is above threshold
-            if j > i + 1:  # At least 2 points
-                time_diff = (
-                    gps_points[j - 1].timestamp - gps_points[i].timestamp
-                ).total_seconds() / 60
-
-                if time_diff >= self.stay_time_threshold:
-                    # Calculate centroid of the stay point
-                    segment_points = gps_points[i:j]
-                    center_lat = sum(p.latitude for p in segment_points) / len(
-                        segment_points
-                    )
-                    center_lng = sum(p.longitude for p in segment_points) / len(
-                        segment_points
-                    )
-
-                    # Aggregate metadata
-                    metadata = {}
-                    activity_types = defaultdict(int)
-                    for p in segment_points:
-                        activity = p.metadata.get("activity_type")
-                        if activity:
-                            activity_types[activity] += 1
-
-                    if activity_types:
-                        # Use most common activity type
-                        metadata["activity_type"] = max(
-                            activity_types.items(), key=lambda x: x[1]
-                        )[0]
-
-                    # Use metadata from the first point for other fields
-                    for key in ["location_name", "address", "source"]:
-                        if gps_points[i].metadata.get(key):
-                            metadata[key] = gps_points[i].metadata[key]
-
-                    stay_point = StayPoint(
-                        latitude=center_lat,
-                        longitude=center_lng,
-                        start_time=gps_points[i].timestamp,
-                        end_time=gps_points[j - 1].timestamp,
-                        point_count=len(segment_points),
-                        **metadata,
-                    )
-                    stay_points.append(stay_point)
-
-                    print(f"        Found stay point: {stay_point}")
-
-            # Move to next non-overlapping segment
-            i = max(i + 1, j)
+        for i, j in segments.tolist():
+            # Calculate centroid of the stay point
+            center_lat = trail.latitudes[i:j].mean()
+            center_lng = trail.longitudes[i:j].mean()
+
+            # Aggregate metadata
+            metadata = {}
+            activity_types = defaultdict(int)
+            for point_metadata in trail.metadata[i:j]:
+                activity = point_metadata.get("activity_type")
+                if activity:
+                    activity_types[activity] += 1
+
+            if activity_types:
+                # Use most common activity type
+                metadata["activity_type"] = max(
+                    activity_types.items(), key=lambda x: x[1]
+                )[0]
+
+            # Use metadata from the first point for other fields
+            for key in ["location_name", "address", "source"]:
+                if trail.metadata[i].get(key):
+                    metadata[key] = trail.metadata[i][key]
+
+            stay_point = StayPoint(
+                latitude=center_lat,
+                longitude=center_lng,
+                start_time=trail.timestamps[i],
+                end_time=trail.timestamps[j - 1],
+                point_count=j - i,
+                **metadata,
+            )
+            stay_points.append(stay_point)
+
+            logger.debug("Found stay point: %s", stay_point)
 
         return stay_points
 
     def _cluster_stay_points(
-        self, stay_points: List[StayPoint]
-    ) -> List[LocationCluster]:
+        self, stay_points: list[StayPoint]
+    ) -> list[LocationCluster]:
         """
         Cluster stay points using DBSCAN to find commonly visited places.
         """
         if len(stay_points) < self.min_cluster_visits:
-            print(
-                f"      Not enough stay points ({len(stay_points)}) for clustering (min: {self.min_cluster_visits})"
+            logger.debug(
+                "Not enough stay points (%d) for clustering (min: %d)",
+                len(stay_points),
+                self.min_cluster_visits,
             )
             return []
 
-        # Convert to coordinate array for DBSCAN
-        coordinates = np.array([[sp.latitude, sp.longitude] for sp in stay_points])
+        # Convert to a radian coordinate array for haversine DBSCAN
+        degrees = np.array([[sp.latitude, sp.longitude] for sp in stay_points])
+        coordinates = np.radians(degrees)
 
-        # Convert distance threshold to approximate degrees
-        # Rough approximation: 1 degree ≈ 111,000 meters
-        eps_degrees = self.cluster_distance_threshold / 111000.0
-
-        print(
-            f"      Clustering with eps={eps_degrees:.6f} degrees (~{self.cluster_distance_threshold}m), min_samples={self.min_cluster_visits}"
+        logger.debug(
+            "Clustering with eps=%.8f radians (%sm), min_samples=%d",
+            self._dbscan.eps,
+            self.cluster_distance_threshold,
+            self.min_cluster_visits,
         )
 
-        # Apply DBSCAN clustering
-        dbscan = DBSCAN(
-            eps=eps_degrees, min_samples=self.min_cluster_visits, metric="euclidean"
-        )
-        cluster_labels = dbscan.fit_predict(coordinates)
+        # Apply DBSCAN clustering with great-circle distances over a ball tree
+        cluster_labels = self._dbscan.fit_predict(coordinates)
 
         # Group stay points by cluster
         clusters_dict = defaultdict(list)
@@ -311,20 +608,30 @@ class LocationClusterer:
             if label != -1:  # -1 indicates noise/outlier
                 clusters_dict[label].append(stay_points[i])
 
-        print(
-            f"      DBSCAN found {len(clusters_dict)} clusters from {len(stay_points)} stay points"
+        logger.debug(
+            "DBSCAN found %d clusters from %d stay points",
+            len(clusters_dict),
+            len(stay_points),
+        )
+
+        # Calculate every cluster centroid in one grouped pass over the labels
+        clustered = cluster_labels != -1
+        labels = cluster_labels[clustered]
+        counts = np.bincount(labels)
+        centroids = (
+            np.column_stack(
+                (
+                    np.bincount(labels, weights=degrees[clustered, 0]),
+                    np.bincount(labels, weights=degrees[clustered, 1]),
+                )
+            )
+            / counts[:, np.newaxis]
         )
 
         # Create LocationCluster objects
         clusters = []
         for cluster_id, cluster_stay_points in clusters_dict.items():
-            # Calculate cluster centroid
-            center_lat = sum(sp.latitude for sp in cluster_stay_points) / len(
-                cluster_stay_points
-            )
-            center_lng = sum(sp.longitude for sp in cluster_stay_points) / len(
-                cluster_stay_points
-            )
+            center_lat, center_lng = centroids[cluster_id]
 
             # Try to get a meaningful name from the stay points
             name = ""
@@ -346,35 +653,19 @@ class LocationClusterer:
             )
             clusters.append(cluster)
 
-            print(f"        Cluster {cluster_id}: {cluster}")
+            logger.debug("Cluster %d: %s", cluster_id, cluster)
 
         return clusters
 
-    def _calculate_distance(
-        self, lat1: float, lon1: float, lat2: float, lon2: float
-    ) -> float:
-        """Calculate distance between two points in meters using Haversine formula."""
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = (
-            math.sin(dlat / 2) ** 2
-            + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-        )
-        c = 2 * math.asin(math.sqrt(a))
-        r = 6371000  # Earth's radius in meters
-
-        return c * r
-
 
 def process_location_data(
-    gps_data: List[Dict],
+    gps_data: list[dict],
     stay_distance_threshold: int = 100,
     stay_time_threshold: int = 10,
     cluster_distance_threshold: int = 200,
     min_cluster_visits: int = 2,
-) -> List[LocationCluster]:
+    stay_detection_workers: int = 1,
+) -> list[LocationCluster]:
     """
     Convenience function to process GPS data into location clusters.
 
@@ -384,6 +675,7 @@ def process_location_data(
         stay_time_threshold: Min time for stay point detection (minutes)
         cluster_distance_threshold: Max distance for clustering stay points (meters)
         min_cluster_visits: Minimum visits required to form a cluster
+        stay_detection_workers: Processes used to detect stay points on large trails
 
     Returns:
         List of LocationCluster objects sorted by visit frequency
@@ -393,6 +685,7 @@ def process_location_data(
         stay_time_threshold_minutes=stay_time_threshold,
         cluster_distance_threshold_meters=cluster_distance_threshold,
         min_cluster_visits=min_cluster_visits,
+        stay_detection_workers=stay_detection_workers,
     )
 
     return clusterer.process_gps_trail(gps_data)
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (("djangoapp", "0009_placeanalysis"),)
+
+    operations = (
+        migrations.AddIndex(
+            model_name="location",
+            index=models.Index(
+                fields=["-visit_count"], name="djangoapp_l_visit_c_2f85cc_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["-sentiment", "-created_at"],
+                name="djangoapp_m_sentime_96f4a9_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["-created_at"], name="djangoapp_m_created_011eb4_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="personanalysis",
+            index=models.Index(
+                fields=["-correlation_coefficient"],
+                name="djangoapp_p_correla_47fd28_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="placeanalysis",
+            index=models.Index(
+                fields=["-correlation_coefficient"],
+                name="djangoapp_p_correla_1cc8af_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="websiteanalysis",
+            index=models.Index(
+                fields=["-correlation_coefficient"],
+                name="djangoapp_w_correla_80ca18_idx",
+            ),
+        ),
+    )
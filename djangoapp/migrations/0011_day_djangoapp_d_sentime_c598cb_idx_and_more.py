@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = (
+        ("djangoapp", "0010_location_djangoapp_l_visit_c_2f85cc_idx_and_more"),
+    )
+
+    operations = (
+        migrations.AddIndex(
+            model_name="day",
+            index=models.Index(
+                fields=["sentiment"], name="djangoapp_d_sentime_c598cb_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="day",
+            index=models.Index(
+                fields=["message_count"], name="djangoapp_d_message_36d39a_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["day", "source"], name="djangoapp_m_day_id_1118d2_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["day", "sentiment"], name="djangoapp_m_day_id_133a32_idx"
+            ),
+        ),
+    )
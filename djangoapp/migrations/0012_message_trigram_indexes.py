@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:29
+
+from django.db import migrations
+
+# MessageFilter's text/contact filters use icontains, which Postgres renders as
+# UPPER(column::text) LIKE UPPER(%s). Trigram GIN indexes on that exact
+# expression let the planner answer substring searches without a table scan.
+TRIGRAM_INDEXES = {
+    "djangoapp_message_text_trgm": "text",
+    "djangoapp_message_contact_trgm": "contact",
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index_name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {index_name} ON djangoapp_message "
+            f"USING gin ((UPPER({column}::text)) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    for index_name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {index_name}")
+
+
+class Migration(migrations.Migration):
+    dependencies = (("djangoapp", "0011_day_djangoapp_d_sentime_c598cb_idx_and_more"),)
+
+    operations = (migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),)
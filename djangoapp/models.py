@@ -1,19 +1,179 @@
 import logging
-import math
 import os
 from collections import defaultdict
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date
+from functools import lru_cache
 from urllib.parse import urlparse
 
 import boto3
-from dateutil.parser import parse as parse_date
-from django.db import models
+import numpy as np
+from botocore.config import Config
+from django.db import DatabaseError, connection, models, transaction
+from django.utils import timezone
+from postgrest.exceptions import APIError
 from supabase import Client, create_client
 
-from .location_clustering import process_location_data
+from .location_clustering import (
+    parse_timestamp,
+    process_location_data,
+)
 
 logger = logging.getLogger(__name__)
 
+# AWS Comprehend BatchDetectSentiment limits
+COMPREHEND_BATCH_SIZE = 25
+COMPREHEND_MAX_DOCUMENT_BYTES = 5000
+
+# Comprehend batches kept in flight at once; each call is mostly network wait
+COMPREHEND_MAX_WORKERS = 8
+
+# Rows fetched between progress lines while paging through Supabase
+FETCH_PROGRESS_INTERVAL = 10_000
+
+# Browser history pages requested from Supabase at once
+BROWSER_HISTORY_FETCH_WORKERS = 8
+
+# Supabase views the analysis reads, created by databases/setup_supabase.py
+SUPABASE_VIEWS = (
+    "imessages_by_day",
+    "whatsapp_messages_by_day",
+    "browser_history_daily_sites",
+)
+
+# PostgREST error codes for a table or view that doesn't exist
+MISSING_RELATION_CODES = frozenset({"42P01", "PGRST205"})
+
+# Postgres advisory lock key held while Message's indexes are dropped for a load
+MESSAGE_INDEX_LOCK_KEY = 0x6D736769
+
+
+@lru_cache(maxsize=1)
+def _get_supabase_client(supabase_url: str, supabase_key: str) -> Client:
+    """Return a Supabase client shared by every analysis using these credentials."""
+    return create_client(supabase_url, supabase_key)
+
+
+@lru_cache(maxsize=1)
+def _get_comprehend_client(aws_access_key: str, aws_secret_key: str, aws_region: str):
+    """Return an AWS Comprehend client shared by every analysis using these credentials."""
+    return boto3.client(
+        "comprehend",
+        aws_access_key_id=aws_access_key,
+        aws_secret_access_key=aws_secret_key,
+        region_name=aws_region,
+        # Concurrent batches can hit the TPS quota; adaptive retries back
+        # off on ThrottlingException and rate-limit the client
+        config=Config(retries={"max_attempts": 10, "mode": "adaptive"}),
+    )
+
+
+# Most visits go to a few thousand sites, so parsed hosts are memoised
+@lru_cache(maxsize=131072)
+def _extract_domain(url: str) -> str:
+    """Extract domain from URL, removing www. prefix."""
+    domain = None
+    if url.startswith(("https://", "http://")) and url.isascii() and url.isprintable():
+        # Fast path: the host is everything up to the first / ? or # after
+        # the scheme, which is what urlparse reports as the netloc
+        rest = url.partition("://")[2]
+        end = len(rest)
+        for separator in "/?#":
+            index = rest.find(separator, 0, end)
+            if index != -1:
+                end = index
+        if "[" not in rest[:end] and "]" not in rest[:end]:
+            domain = rest[:end].lower()
+
+    if domain is None:
+        # IPv6 hosts, other schemes and unusual characters go through urlparse
+        try:
+            domain = urlparse(url).netloc.lower()
+        except Exception as e:
+            logger.warning("Error extracting domain from URL '%s': %s", url, e)
+            return ""
+
+    # Remove www. prefix
+    if domain.startswith("www."):
+        domain = domain[4:]
+
+    return domain
+
+
+def _missing_supabase_views(supabase: Client) -> list[str]:
+    """
+    Return the SUPABASE_VIEWS that don't exist in the Supabase project.
+    Each view is probed with LIMIT 0, so an aggregating view is never
+    actually computed. Errors other than a missing relation are re-raised.
+    """
+    missing = []
+    for view in SUPABASE_VIEWS:
+        try:
+            supabase.table(view).select("*").limit(0).execute()
+        except APIError as e:
+            if e.code not in MISSING_RELATION_CODES:
+                raise
+            missing.append(view)
+    return missing
+
+
+# Generic/system contacts that don't name a person
+SKIP_CONTACTS = frozenset(
+    {
+        "unknown",
+        "me",
+        "",
+        "system",
+        "group",
+        "chat",
+        "whatsapp",
+        "imessage",
+        "sms",
+        "mms",
+    }
+)
+
+
+# The same few hundred contacts recur across every message
+@lru_cache(maxsize=8192)
+def _normalize_contact_name(contact: str) -> str:
+    """Normalize contact names for consistent matching."""
+    if not contact:
+        return ""
+
+    contact = contact.strip()
+    lowered = contact.lower()
+
+    # Skip empty and generic/system contacts
+    if lowered in SKIP_CONTACTS:
+        return ""
+
+    # For WhatsApp group names, extract meaningful part
+    if " group" in lowered or "group " in lowered:
+        # Keep group names but clean them up
+        contact = contact.replace(" Group", "").replace(" group", "")
+
+    return contact
+
+
+def _is_storable_message(message: dict) -> bool:
+    """
+    Check that a message fits Message's columns: no NUL characters (which
+    PostgreSQL text rejects), a contact within its max_length, and a
+    non-null timestamp within its max_length.
+    """
+    contact = message.get("contact", "")
+    timestamp = message.get("timestamp")
+    return (
+        "\x00" not in message["text"]
+        and contact is not None
+        and "\x00" not in contact
+        and len(contact) <= Message._meta.get_field("contact").max_length
+        and timestamp is not None
+        and len(str(timestamp)) <= Message._meta.get_field("timestamp").max_length
+    )
+
 
 class TimeAnalysis(models.Model):
     """Model for storing time-based sentiment analysis results."""
@@ -56,6 +216,148 @@ class TimeAnalysis(models.Model):
             print(f"📅 Date range: {self.start_date} to {self.end_date}")
             self.perform_sentiment_analysis()
 
+    def _clear_previous_results(self) -> dict | None:
+        """
+        Empty the Message, Day and Location tables, plus the PlaceAnalysis rows
+        that cascade from Location.
+
+        Uses a single TRUNCATE on PostgreSQL, which takes constant time and
+        skips Django's collector loading every row. Other databases use plain
+        DELETE statements in dependency order.
+
+        Returns rows removed per model name when they were deleted, or None
+        after a TRUNCATE, which doesn't report counts.
+        """
+        models_to_clear = (Message, Day, PlaceAnalysis, Location)
+        quoted_tables = [
+            connection.ops.quote_name(model._meta.db_table) for model in models_to_clear
+        ]
+
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute(f"TRUNCATE TABLE {', '.join(quoted_tables)}")
+                return None
+
+            # Each DELETE reports its own row count, so no COUNT(*) is needed
+            deleted = {}
+            with transaction.atomic():
+                for model, table in zip(models_to_clear, quoted_tables):
+                    cursor.execute(f"DELETE FROM {table}")
+                    deleted[model.__name__] = cursor.rowcount
+            return deleted
+
+    @contextmanager
+    def _message_indexes_deferred(self):
+        """
+        Drop Message's Meta indexes for the duration of a bulk load into the
+        freshly emptied table and recreate them afterwards, even if the load fails.
+
+        Only done on PostgreSQL in autocommit mode. Inside an outer transaction
+        (such as the admin's) DROP INDEX would hold an exclusive lock on the
+        table until that transaction commits, so the load keeps its indexes
+        there. An advisory lock keeps overlapping analyses from dropping or
+        recreating the indexes at the same time; whichever doesn't get it loads
+        with the indexes in place.
+        """
+        if connection.vendor != "postgresql" or connection.in_atomic_block:
+            yield
+            return
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", [MESSAGE_INDEX_LOCK_KEY])
+            if not cursor.fetchone()[0]:
+                yield
+                return
+
+            try:
+                quote_name = connection.ops.quote_name
+                table = quote_name(Message._meta.db_table)
+                for index in Message._meta.indexes:
+                    cursor.execute(f"DROP INDEX IF EXISTS {quote_name(index.name)}")
+                try:
+                    yield
+                finally:
+                    # A failed rebuild leaves Message without that index, so it
+                    # is raised; an error from the load stays chained to it
+                    for index in Message._meta.indexes:
+                        columns = ", ".join(
+                            f"{quote_name(Message._meta.get_field(name).column)} {order}".rstrip()
+                            for name, order in index.fields_orders
+                        )
+                        try:
+                            cursor.execute(
+                                f"CREATE INDEX IF NOT EXISTS {quote_name(index.name)} "
+                                f"ON {table} ({columns})"
+                            )
+                        except DatabaseError as e:
+                            logger.error("Error recreating index %s: %s", index.name, e)
+                            raise
+            finally:
+                cursor.execute(
+                    "SELECT pg_advisory_unlock(%s)", [MESSAGE_INDEX_LOCK_KEY]
+                )
+
+    def _insert_messages(self, day, analyzed_messages: list):
+        """
+        Insert a day's (message, sentiment) pairs as Message rows.
+
+        On PostgreSQL with psycopg 3 the rows are streamed with COPY FROM
+        STDIN, which skips parsing an INSERT statement per batch. Other
+        databases and drivers use bulk_create.
+        """
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                if hasattr(cursor.cursor, "copy"):
+                    fields = [
+                        Message._meta.get_field(name)
+                        for name in (
+                            "day",
+                            "text",
+                            "sentiment",
+                            "source",
+                            "contact",
+                            "timestamp",
+                            "created_at",
+                        )
+                    ]
+                    columns = ", ".join(
+                        connection.ops.quote_name(field.column) for field in fields
+                    )
+                    table = connection.ops.quote_name(Message._meta.db_table)
+                    # COPY bypasses auto_now_add, so stamp the rows here
+                    created_at = timezone.now()
+                    with cursor.cursor.copy(
+                        f"COPY {table} ({columns}) FROM STDIN"
+                    ) as copy:
+                        for message, result in analyzed_messages:
+                            copy.write_row(
+                                (
+                                    day.pk,
+                                    message["text"],
+                                    result,
+                                    message["source"],
+                                    message.get("contact", ""),
+                                    message.get("timestamp"),
+                                    created_at,
+                                )
+                            )
+                    return
+
+        Message.objects.bulk_create(
+            [
+                Message(
+                    day=day,
+                    text=message["text"],
+                    sentiment=result,
+                    source=message["source"],
+                    contact=message.get("contact", ""),
+                    timestamp=message.get("timestamp"),
+                )
+                for message, result in analyzed_messages
+            ],
+            batch_size=1000,
+        )
+
     def perform_sentiment_analysis(self):
         """
         Perform sentiment analysis on all messages within the date range.
@@ -64,32 +366,14 @@ class TimeAnalysis(models.Model):
         print("🔄 Starting sentiment analysis...")
 
         # Clear ALL existing Day, Message, and Location objects (from all TimeAnalyses)
-        existing_messages_count = Message.objects.count()
-        existing_days_count = Day.objects.count()
-        existing_locations_count = Location.objects.count()
-
-        if existing_messages_count > 0:
-            print(f"🗑️  Clearing {existing_messages_count} existing Message records...")
-            Message.objects.all().delete()
-            print("✅ All existing Message records cleared")
-
-        if existing_days_count > 0:
-            print(f"🗑️  Clearing {existing_days_count} existing Day records...")
-            Day.objects.all().delete()
-            print("✅ All existing Day records cleared")
-
-        if existing_locations_count > 0:
-            print(
-                f"🗑️  Clearing {existing_locations_count} existing Location records..."
-            )
-            Location.objects.all().delete()
-            print("✅ All existing Location records cleared")
-
-        if (
-            existing_messages_count == 0
-            and existing_days_count == 0
-            and existing_locations_count == 0
-        ):
+        print("🗑️  Clearing existing Day, Message and Location records...")
+        deleted = self._clear_previous_results()
+        if deleted is None:
+            print("✅ All existing Day, Message and Location records cleared")
+        elif any(deleted.values()):
+            for model_name, count in deleted.items():
+                print(f"✅ Cleared {count} existing {model_name} records")
+        else:
             print("ℹ️  No existing Day/Message/Location records to clear")
 
         self.status = "processing"
@@ -123,13 +407,24 @@ class TimeAnalysis(models.Model):
             return
         print(f"✅ AWS credentials found for region: {aws_region}")
 
-        supabase: Client = create_client(supabase_url, supabase_key)
-        comprehend = boto3.client(
-            "comprehend",
-            aws_access_key_id=aws_access_key,
-            aws_secret_access_key=aws_secret_key,
-            region_name=aws_region,
-        )
+        # Reuse clients (and their connection pools) across analyses
+        supabase: Client = _get_supabase_client(supabase_url, supabase_key)
+        comprehend = _get_comprehend_client(aws_access_key, aws_secret_key, aws_region)
+
+        # The fetchers treat any query error as "no data", so check up front that
+        # the views they read exist rather than completing an empty analysis
+        print("🔎 Checking Supabase views...")
+        missing_views = _missing_supabase_views(supabase)
+        if missing_views:
+            print(f"❌ Missing Supabase views: {', '.join(missing_views)}")
+            self.status = "error"
+            self.error_message = (
+                f"Missing Supabase views: {', '.join(missing_views)}. "
+                "Run databases/setup_supabase.py to create them."
+            )
+            self.save(update_fields=["status", "error_message"])
+            return
+        print("✅ Supabase views found")
 
         # Group messages by day - now storing individual messages with metadata
         daily_messages = defaultdict(list)  # date_str -> list of message dicts
@@ -158,196 +453,262 @@ class TimeAnalysis(models.Model):
         created_days = 0
         created_messages = 0
 
-        for date_str, message_list in daily_messages.items():
-            if not message_list:
-                continue
+        # Sentiment per distinct text, shared by every day of this run. Scoring
+        # every day's texts up front keeps the Comprehend batches of the whole
+        # run in flight together, rather than a day's worth at a time
+        sentiment_cache = {}
+        self._analyze_texts(
+            comprehend,
+            [
+                message["text"]
+                for message_list in daily_messages.values()
+                for message in message_list
+            ],
+            sentiment_cache,
+        )
 
-            print(f"  📅 Processing {len(message_list)} messages for {date_str}...")
+        # Gathered while the days are written so the correlation passes below
+        # neither re-query the days nor walk the messages again
+        day_index = {}  # date_str -> position in day_sentiment, in date order
+        day_sentiment = []  # average sentiment of each written day
+        daily_person_interactions = {}  # date_str -> set of contact names
+
+        # The tables were just emptied, so building Message's indexes once
+        # after the load is cheaper than updating them on every insert
+        with self._message_indexes_deferred():
+            # ISO day strings sort chronologically, so days are written in order
+            for date_str, message_list in sorted(daily_messages.items()):
+                if not message_list:
+                    continue
+
+                print(f"  📅 Processing {len(message_list)} messages for {date_str}...")
+
+                # Every text was scored above; ones Comprehend failed on are None
+                sentiment_results = [
+                    sentiment_cache.get(msg["text"]) for msg in message_list
+                ]
+
+                # Keep the successful analyses for a single insert per day.
+                # Messages that don't fit the Message columns are dropped here,
+                # so one bad row can't fail the whole day's insert
+                day_sentiments = []
+                analyzed_messages = []
+                unstorable_count = 0
+                for message, result in zip(message_list, sentiment_results):
+                    if result is None:
+                        continue
+                    if not _is_storable_message(message):
+                        unstorable_count += 1
+                        continue
+                    analyzed_messages.append((message, result))
+                    day_sentiments.append(result)
 
-            # Create Day object
-            try:
-                date_obj = datetime.strptime(date_str, "%Y-%m-%d").date()
-                day = Day.objects.create(
-                    time_analysis=self,
-                    date=date_obj,
-                    sentiment=0.0,  # Will be updated after processing messages
-                    message_count=len(message_list),
-                )
-                created_days += 1
-                print(f"    ✅ Created Day: {date_obj}")
-            except Exception as e:
-                print(f"    ❌ Error creating Day for {date_str}: {e}")
-                logger.error(f"Error creating Day object for {date_str}: {e}")
-                continue
+                if unstorable_count:
+                    print(
+                        f"    ⚠️  Skipped {unstorable_count} messages that can't be stored"
+                    )
 
-            # Process messages in batches for sentiment analysis
-            batch_size = 25  # AWS Comprehend BatchDetectSentiment limit
-            day_sentiments = []
+                if not day_sentiments:
+                    print(f"    ❌ No valid messages for {date_str}, skipped day")
+                    continue
 
-            for i in range(0, len(message_list), batch_size):
-                batch = message_list[i : i + batch_size]
-                text_list = [msg["text"] for msg in batch]
+                avg_sentiment = sum(day_sentiments) / len(day_sentiments)
 
-                print(
-                    f"      Analyzing batch {i // batch_size + 1} ({len(batch)} messages)..."
-                )
+                # Write the day and all of its messages in one transaction, with
+                # the messages going in as a single bulk load
+                try:
+                    with transaction.atomic():
+                        date_obj = date.fromisoformat(date_str)
+                        day = Day.objects.create(
+                            time_analysis=self,
+                            date=date_obj,
+                            sentiment=avg_sentiment,
+                            message_count=len(message_list),
+                        )
+                        self._insert_messages(day, analyzed_messages)
+                except Exception as e:
+                    print(f"    ❌ Error saving Day and Messages for {date_str}: {e}")
+                    logger.error(
+                        f"Error saving Day and Message objects for {date_str}: {e}"
+                    )
+                    continue
 
-                # Analyze sentiment for the batch
-                sentiment_results = self._analyze_sentiment_batch(comprehend, text_list)
-
-                if sentiment_results:
-                    # Create Message objects for successful analyses
-                    for j, result in enumerate(sentiment_results):
-                        if result is not None:
-                            try:
-                                message_obj = Message.objects.create(
-                                    day=day,
-                                    text=batch[j]["text"],
-                                    sentiment=result,
-                                    source=batch[j]["source"],
-                                    contact=batch[j].get("contact", ""),
-                                    timestamp=batch[j].get("timestamp"),
-                                )
-                                day_sentiments.append(result)
-                                created_messages += 1
-                            except Exception as e:
-                                print(f"        ❌ Error creating Message: {e}")
-                                logger.error(f"Error creating Message object: {e}")
-
-            # Update day's average sentiment
-            if day_sentiments:
-                avg_sentiment = sum(day_sentiments) / len(day_sentiments)
-                day.sentiment = avg_sentiment
-                day.save(update_fields=["sentiment"])
+                created_days += 1
+                created_messages += len(analyzed_messages)
                 print(
                     f"    📊 Day {date_str}: avg sentiment {avg_sentiment:.3f} ({len(day_sentiments)} messages)"
                 )
-            else:
-                # No valid messages, delete the day
-                day.delete()
-                created_days -= 1
-                print(f"    ❌ No valid messages for {date_str}, deleted day")
+
+                day_index[date_str] = len(day_sentiment)
+                day_sentiment.append(avg_sentiment)
+                contacts_for_day = self._extract_day_contacts(message_list)
+                if contacts_for_day:
+                    daily_person_interactions[date_str] = contacts_for_day
 
         print(
             f"🎉 Analysis complete! Created {created_days} Day records and {created_messages} Message records"
         )
 
+        day_sentiment = np.array(day_sentiment, dtype=np.float64)
+
         # SECOND PASS: Website correlation analysis
         print("\n🌐 Starting website correlation analysis (second pass)...")
-        self._analyze_website_correlations(supabase)
+        self._analyze_website_correlations(supabase, day_index, day_sentiment)
 
         # THIRD PASS: Person correlation analysis
         print("\n👥 Starting person correlation analysis (third pass)...")
-        self._analyze_person_correlations(daily_messages)
+        self._analyze_person_correlations(
+            daily_person_interactions, day_index, day_sentiment
+        )
 
         # FOURTH PASS: Place correlation analysis
         print("\n📍 Starting place correlation analysis (fourth pass)...")
-        self._analyze_place_correlations()
+        self._analyze_place_correlations(day_index, day_sentiment)
 
         self.status = "completed"
         self.save(update_fields=["status"])
         print(f"📊 Status updated to: {self.status}")
 
-    def _fetch_imessages(self, supabase: Client, daily_messages: dict):
-        """Fetch iMessages from Supabase and group by day."""
-        try:
-            # The actual timestamps are in the 'service' column, not 'timestamp'
-            # We can filter at the database level since service contains proper datetime strings
-            # Only include messages sent BY the user (is_from_me = true)
-            start_datetime = f"{self.start_date} 00:00:00"
-            end_datetime = f"{self.end_date} 23:59:59"
+    def _iter_rows(
+        self,
+        supabase: Client,
+        table: str,
+        columns: str,
+        filters: list,
+        order_column: str,
+        label: str,
+        batch_size: int = 1000,
+        max_workers: int = 1,
+        tiebreak_column: str = "id",
+    ):
+        """
+        Yield rows from a Supabase table page by page.
 
-            print(
-                f"    📱 Querying iMessages from {start_datetime} to {end_datetime} (only sent by user)"
+        Each filter is a (method, column, value) tuple applied to the query,
+        e.g. ("gte", "timestamp", start). Pages are ordered by order_column and
+        then tiebreak_column, which must tell apart rows sharing an order_column
+        value, so range() pagination never skips or repeats a row.
+
+        With max_workers > 1 the first page also asks for the exact row count,
+        and the remaining pages are requested concurrently. If no count comes
+        back, the remaining pages are fetched one by one instead. Rows are
+        yielded in order either way.
+        """
+
+        def fetch_page(offset, count=None):
+            query = supabase.table(table).select(columns, count=count)
+            for method, column, value in filters:
+                query = getattr(query, method)(column, value)
+            return (
+                query.order(order_column)
+                .order(tiebreak_column)
+                .range(offset, offset + batch_size - 1)
+                .execute()
             )
 
-            # Fetch messages with pagination
-            all_messages = []
-            batch_size = 1000
+        def pages():
             offset = 0
+            if max_workers > 1:
+                response = fetch_page(0, count="exact")
+                yield response.data
+                if response.count is not None:
+                    if response.count > batch_size:
+                        # Fetch the remaining pages concurrently; map keeps
+                        # them in order
+                        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                            for page in executor.map(
+                                fetch_page,
+                                range(batch_size, response.count, batch_size),
+                            ):
+                                yield page.data
+                    return
+
+                # Without a row count, carry on page by page after the first
+                if len(response.data) < batch_size:
+                    return
+                offset = batch_size
 
             while True:
-                response = (
-                    supabase.table("imessages")
-                    .select("text, service, contact, is_from_me")
-                    .gte("service", start_datetime)
-                    .lte("service", end_datetime)
-                    .eq("is_from_me", True)  # Only messages sent by the user
-                    .range(offset, offset + batch_size - 1)
-                    .execute()
-                )
+                response = fetch_page(offset)
+                yield response.data
+                if len(response.data) < batch_size:
+                    return  # No more data
+                offset += batch_size
 
-                if not response.data:
-                    break
+        total = 0
+        next_progress = FETCH_PROGRESS_INTERVAL
 
-                all_messages.extend(response.data)
-                offset += batch_size
+        for data in pages():
+            if not data:
+                return
 
-                print(
-                    f"      Fetched batch {offset // batch_size}: {len(response.data)} messages (total: {len(all_messages)})"
-                )
+            total += len(data)
+            if total >= next_progress:
+                print(f"      Fetched {total} {label} so far...")
+                next_progress = total + FETCH_PROGRESS_INTERVAL
 
-                if len(response.data) < batch_size:
-                    break  # No more data
+            yield from data
+
+    def _fetch_imessages(self, supabase: Client, daily_messages: dict):
+        """Fetch iMessages from Supabase and group by day."""
+        try:
+            # The actual timestamps are in the 'service' column, not 'timestamp'
+            # We can filter at the database level since service contains proper datetime strings
+            # Only include messages sent BY the user (is_from_me = true)
+            start_datetime = f"{self.start_date} 00:00:00"
+            end_datetime = f"{self.end_date} 23:59:59"
 
             print(
-                f"    📱 Found {len(all_messages)} iMessages sent by user in date range"
+                f"    📱 Querying iMessages from {start_datetime} to {end_datetime} (only sent by user)"
             )
 
-            # Verify we only have user messages
-            user_messages = [
-                msg for msg in all_messages if msg.get("is_from_me") == True
-            ]
-            if len(user_messages) != len(all_messages):
-                print(
-                    f"    ⚠️  Warning: Found {len(all_messages) - len(user_messages)} non-user iMessages that shouldn't be there!"
-                )
+            # Days come back from the views as ISO strings, which order like dates
+            start_day = self.start_date.isoformat()
+            end_day = self.end_date.isoformat()
+
+            # Stream pages straight into the daily groups
+            message_count = 0
+            unsupported_count = 0
+            rows = self._iter_rows(
+                supabase,
+                "imessages_by_day",
+                "text, service, contact, day",
+                [
+                    ("gte", "service", start_datetime),
+                    ("lte", "service", end_datetime),
+                    ("eq", "is_from_me", True),  # Only messages sent by the user
+                ],
+                "service",
+                "messages",
+            )
 
-            # Group messages by date
-            for message in all_messages:
+            # is_from_me is filtered server-side, so it isn't fetched per row
+            for message in rows:
+                message_count += 1
                 if message.get("text") and message.get("service"):
-                    # Double-check this is from the user
-                    if not message.get("is_from_me"):
-                        print(
-                            f"    ⚠️  Skipping iMessage not from user: is_from_me={message.get('is_from_me')}"
-                        )
-                        continue
-
                     # Skip unsupported message types
                     if "[Unsupported message type]" in message.get("text", ""):
-                        print("    ⚠️  Skipping unsupported message type")
+                        unsupported_count += 1
                         continue
 
-                    # Debug: Check for problematic message
-                    if "I'm totally stumped" in message.get("text", ""):
-                        print("    🔍 FOUND PROBLEMATIC MESSAGE:")
-                        print(f"        text: '{message.get('text')}'")
-                        print(f"        contact: '{message.get('contact')}'")
-                        print(f"        is_from_me: {message.get('is_from_me')}")
-                        print(f"        service: '{message.get('service')}'")
-
-                    try:
-                        # Parse the service field as timestamp
-                        parsed_date = parse_date(message["service"]).date()
-
-                        if self.start_date <= parsed_date <= self.end_date:
-                            date_str = parsed_date.isoformat()
-                            daily_messages[date_str].append(
-                                {
-                                    "text": message["text"],
-                                    "source": "iMessage",
-                                    "contact": message.get(
-                                        "contact", ""
-                                    ),  # This is the recipient
-                                    "timestamp": message["service"],
-                                }
-                            )
-
-                    except Exception as e:
-                        logger.warning(
-                            f"Error parsing iMessage service timestamp '{message.get('service')}': {e}"
+                    # The view already carries the service timestamp's day
+                    date_str = message["day"]
+                    if start_day <= date_str <= end_day:
+                        daily_messages[date_str].append(
+                            {
+                                "text": message["text"],
+                                "source": "iMessage",
+                                "contact": message.get(
+                                    "contact", ""
+                                ),  # This is the recipient
+                                "timestamp": message["service"],
+                            }
                         )
 
+            print(f"    📱 Found {message_count} iMessages sent by user in date range")
+            if unsupported_count:
+                print(f"    ⚠️  Skipped {unsupported_count} unsupported message types")
+
         except Exception as e:
             print(f"    ❌ Error fetching iMessages: {e}")
             logger.error(f"Error fetching iMessages: {e}")
@@ -361,133 +722,60 @@ class TimeAnalysis(models.Model):
                 f"    💬 Querying WhatsApp messages from {self.start_date} to {self.end_date} (only sent by user)"
             )
 
-            # Fetch messages with pagination - get more fields to identify recipient
-            all_messages = []
-            batch_size = 1000
-            offset = 0
-
-            while True:
-                response = (
-                    supabase.table("whatsapp_messages")
-                    .select("text, timestamp, from_name, chat_name")
-                    .gte("timestamp", self.start_date.isoformat())
-                    .lte("timestamp", self.end_date.isoformat())
-                    .eq("from_name", "Me")  # Only messages sent by the user
-                    .range(offset, offset + batch_size - 1)
-                    .execute()
-                )
-
-                if not response.data:
-                    break
-
-                all_messages.extend(response.data)
-                offset += batch_size
-
-                print(
-                    f"      Fetched batch {offset // batch_size}: {len(response.data)} messages (total: {len(all_messages)})"
-                )
-
-                if len(response.data) < batch_size:
-                    break  # No more data
-
-            print(
-                f"    💬 Found {len(all_messages)} WhatsApp messages sent by user in date range"
+            # Days come back from the views as ISO strings, which order like dates
+            start_day = self.start_date.isoformat()
+            end_day = self.end_date.isoformat()
+
+            # Stream pages straight into the daily groups - get more fields to
+            # identify recipient
+            message_count = 0
+            unsupported_count = 0
+            rows = self._iter_rows(
+                supabase,
+                "whatsapp_messages_by_day",
+                "text, timestamp, chat_name, day",
+                [
+                    ("gte", "timestamp", self.start_date.isoformat()),
+                    ("lte", "timestamp", self.end_date.isoformat()),
+                    ("eq", "from_name", "Me"),  # Only messages sent by the user
+                ],
+                "timestamp",
+                "messages",
             )
 
-            # Verify we only have user messages
-            user_messages = [
-                msg for msg in all_messages if msg.get("from_name") == "Me"
-            ]
-            if len(user_messages) != len(all_messages):
-                print(
-                    f"    ⚠️  Warning: Found {len(all_messages) - len(user_messages)} non-user messages that shouldn't be there!"
-                )
-
-            # Group messages by date
-            for message in all_messages:
+            # from_name is filtered server-side, so it isn't fetched per row
+            for message in rows:
+                message_count += 1
                 if message.get("text") and message.get("timestamp"):
-                    # Double-check this is from the user
-                    if message.get("from_name") != "Me":
-                        print(
-                            f"    ⚠️  Skipping message not from user: from_name='{message.get('from_name')}'"
-                        )
-                        continue
-
                     # Skip unsupported message types
                     if "[Unsupported message type]" in message.get("text", ""):
-                        print("    ⚠️  Skipping unsupported message type")
+                        unsupported_count += 1
                         continue
 
-                    # Debug: Check for problematic message
-                    if "I'm totally stumped" in message.get("text", ""):
-                        print("    🔍 FOUND PROBLEMATIC MESSAGE IN WHATSAPP:")
-                        print(f"        text: '{message.get('text')}'")
-                        print(f"        chat_name: '{message.get('chat_name')}'")
-                        print(f"        from_name: '{message.get('from_name')}'")
-                        print(f"        timestamp: '{message.get('timestamp')}'")
-
-                    try:
-                        # Parse timestamp (should be proper TIMESTAMPTZ)
-                        parsed_date = parse_date(message["timestamp"]).date()
-
-                        if self.start_date <= parsed_date <= self.end_date:
-                            date_str = parsed_date.isoformat()
-
-                            # For WhatsApp, the recipient is usually in chat_name or to_name
-                            recipient = message.get("chat_name") or "Unknown"
-
-                            daily_messages[date_str].append(
-                                {
-                                    "text": message["text"],
-                                    "source": "WhatsApp",
-                                    "contact": recipient,  # Store the recipient, not sender
-                                    "timestamp": message["timestamp"],
-                                }
-                            )
-
-                    except Exception as e:
-                        logger.warning(
-                            f"Error parsing WhatsApp timestamp '{message.get('timestamp')}': {e}"
+                    # The view already carries the timestamp's UTC day
+                    date_str = message["day"]
+                    if start_day <= date_str <= end_day:
+                        # For WhatsApp, the recipient is usually in chat_name or to_name
+                        recipient = message.get("chat_name") or "Unknown"
+
+                        daily_messages[date_str].append(
+                            {
+                                "text": message["text"],
+                                "source": "WhatsApp",
+                                "contact": recipient,  # Store the recipient, not sender
+                                "timestamp": message["timestamp"],
+                            }
                         )
 
-        except Exception as e:
-            print(f"    ❌ Error fetching WhatsApp messages: {e}")
-            logger.error(f"Error fetching WhatsApp messages: {e}")
-
-    def _fetch_gmail_emails(self, supabase: Client, daily_messages: dict):
-        """Fetch Gmail emails from Supabase and group by day."""
-        try:
-            response = (
-                supabase.table("gmail_emails")
-                .select("body_text, internal_date")
-                .gte("internal_date", int(self.start_date.strftime("%s")) * 1000)
-                .lte("internal_date", int(self.end_date.strftime("%s")) * 1000)
-                .execute()
+            print(
+                f"    💬 Found {message_count} WhatsApp messages sent by user in date range"
             )
-
-            print(f"    ✉️  Found {len(response.data)} Gmail emails")
-            for email in response.data:
-                if email.get("body_text"):
-                    try:
-                        # Gmail internal_date is in milliseconds
-                        timestamp = datetime.fromtimestamp(
-                            email["internal_date"] / 1000
-                        ).date()
-                        date_str = timestamp.isoformat()
-                        if self.start_date <= timestamp <= self.end_date:
-                            daily_messages[date_str].append(
-                                {
-                                    "text": email["body_text"],
-                                    "source": "Gmail",
-                                    "contact": "",
-                                    "timestamp": email["internal_date"],
-                                }
-                            )
-                    except Exception as e:
-                        logger.warning(f"Error parsing Gmail timestamp: {e}")
+            if unsupported_count:
+                print(f"    ⚠️  Skipped {unsupported_count} unsupported message types")
 
         except Exception as e:
-            logger.error(f"Error fetching Gmail emails: {e}")
+            print(f"    ❌ Error fetching WhatsApp messages: {e}")
+            logger.error(f"Error fetching WhatsApp messages: {e}")
 
     def _fetch_location_data(self, supabase: Client):
         """Fetch location data from Supabase and store it."""
@@ -500,86 +788,58 @@ class TimeAnalysis(models.Model):
                 f"    📍 Querying location data from {start_datetime} to {end_datetime}"
             )
 
-            # Fetch location data with pagination
-            all_locations = []
-            batch_size = 1000
-            offset = 0
-
-            while True:
-                response = (
-                    supabase.table("location_history")
-                    .select(
-                        "timestamp, latitude, longitude, accuracy, altitude, speed, heading, activity_type, location_name, address, source"
-                    )
-                    .gte("timestamp", start_datetime)
-                    .lte("timestamp", end_datetime)
-                    .range(offset, offset + batch_size - 1)
-                    .execute()
-                )
+            # Stream pages straight into the format expected by the clustering
+            # algorithm
+            location_count = 0
+            parse_error_count = 0
+            gps_data = []
+            rows = self._iter_rows(
+                supabase,
+                "location_history",
+                "timestamp, latitude, longitude, accuracy, altitude, speed, heading, activity_type, location_name, address, source",
+                [
+                    ("gte", "timestamp", start_datetime),
+                    ("lte", "timestamp", end_datetime),
+                ],
+                "timestamp",
+                "locations",
+            )
 
-                if not response.data:
-                    break
+            for location_data in rows:
+                location_count += 1
+                try:
+                    timestamp = parse_timestamp(location_data["timestamp"])
 
-                all_locations.extend(response.data)
-                offset += batch_size
+                    # Ensure all fields have proper default values to avoid NULL constraint issues
+                    gps_data.append(
+                        {
+                            "latitude": location_data.get("latitude"),
+                            "longitude": location_data.get("longitude"),
+                            "timestamp": timestamp.isoformat(),
+                            "activity_type": location_data.get("activity_type") or "",
+                            "location_name": location_data.get("location_name") or "",
+                            "address": location_data.get("address") or "",
+                            "source": location_data.get("source") or "ios",
+                        }
+                    )
+                except Exception as e:
+                    parse_error_count += 1
+                    logger.warning("Error parsing location data: %s", e)
 
+            print(f"    📍 Found {location_count} location records in date range")
+            if parse_error_count:
                 print(
-                    f"      Fetched batch {offset // batch_size}: {len(response.data)} locations (total: {len(all_locations)})"
+                    f"      ❌ Skipped {parse_error_count} location records that failed to parse"
                 )
 
-                if len(response.data) < batch_size:
-                    break  # No more data
-
-            print(f"    📍 Found {len(all_locations)} location records in date range")
-
-            if not all_locations:
+            if not location_count:
                 print("    ℹ️  No location data to process")
                 return
 
-            # Convert to temporary objects for clustering
-            location_objects = []
-            for location_data in all_locations:
-                try:
-                    timestamp = parse_date(location_data["timestamp"])
-
-                    # Ensure all fields have proper default values to avoid NULL constraint issues
-                    location_obj = {
-                        "timestamp": timestamp,
-                        "latitude": location_data.get("latitude"),
-                        "longitude": location_data.get("longitude"),
-                        "accuracy": location_data.get("accuracy"),
-                        "altitude": location_data.get("altitude"),
-                        "speed": location_data.get("speed"),
-                        "heading": location_data.get("heading"),
-                        "activity_type": location_data.get("activity_type") or "",
-                        "location_name": location_data.get("location_name") or "",
-                        "address": location_data.get("address") or "",
-                        "source": location_data.get("source") or "ios",
-                    }
-                    location_objects.append(location_obj)
-                except Exception as e:
-                    print(f"      ❌ Error parsing location data: {e}")
-                    logger.warning(f"Error parsing location data: {e}")
-
             print(
-                f"    🔍 Clustering {len(location_objects)} location points using new methodology..."
+                f"    🔍 Clustering {len(gps_data)} location points using new methodology..."
             )
 
-            # Convert to format expected by new clustering algorithm
-            gps_data = []
-            for loc_obj in location_objects:
-                gps_data.append(
-                    {
-                        "latitude": loc_obj["latitude"],
-                        "longitude": loc_obj["longitude"],
-                        "timestamp": loc_obj["timestamp"].isoformat(),
-                        "activity_type": loc_obj.get("activity_type", ""),
-                        "location_name": loc_obj.get("location_name", ""),
-                        "address": loc_obj.get("address", ""),
-                        "source": loc_obj.get("source", "ios"),
-                    }
-                )
-
             # Use the new clustering approach
             location_clusters = process_location_data(
                 gps_data,
@@ -590,21 +850,24 @@ class TimeAnalysis(models.Model):
             )
 
             # Convert LocationCluster objects to Django Location models
-            locations = []
-            for cluster in location_clusters:
-                location = Location.objects.create(
-                    time_analysis=self,
-                    name=cluster.name,
-                    center_latitude=cluster.center_latitude,
-                    center_longitude=cluster.center_longitude,
-                    visit_count=cluster.visit_count,
-                    total_time_minutes=int(cluster.total_time_minutes),
-                    first_visit=cluster.first_visit,
-                    last_visit=cluster.last_visit,
-                    address=cluster.address,
-                    activity_types=dict(cluster.activity_types),
-                )
-                locations.append(location)
+            locations = Location.objects.bulk_create(
+                [
+                    Location(
+                        time_analysis=self,
+                        name=cluster.name,
+                        center_latitude=cluster.center_latitude,
+                        center_longitude=cluster.center_longitude,
+                        visit_count=cluster.visit_count,
+                        total_time_minutes=int(cluster.total_time_minutes),
+                        first_visit=cluster.first_visit,
+                        last_visit=cluster.last_visit,
+                        address=cluster.address,
+                        activity_types=cluster.activity_types,
+                    )
+                    for cluster in location_clusters
+                ],
+                batch_size=500,
+            )
 
             print(
                 f"    📍 Created {len(locations)} distinct locations from new clustering methodology"
@@ -614,159 +877,61 @@ class TimeAnalysis(models.Model):
             print(f"    ❌ Error fetching location data: {e}")
             logger.error(f"Error fetching location data: {e}")
 
-    def _cluster_locations(
-        self, location_data: list, cluster_radius_meters: int = 200
-    ) -> list:
+    def _analyze_texts(self, comprehend, texts: list[str], sentiment_cache: dict):
         """
-        Cluster nearby GPS points into distinct locations using distance-based clustering.
-        Returns a list of created Location objects.
+        Score texts with AWS Comprehend into sentiment_cache, sending each
+        distinct text not already in it only once. The batches are kept in
+        flight concurrently. Texts that Comprehend fails on are left out of
+        sentiment_cache, so a later call retries them.
         """
-        if not location_data:
-            return []
-
-        print(
-            f"      🔍 Starting clustering with {len(location_data)} GPS points (radius: {cluster_radius_meters}m)"
-        )
-
-        # Sort by timestamp
-        location_data.sort(key=lambda x: x["timestamp"])
-
-        locations = []
-        unclustered = location_data.copy()
-        cluster_id = 1
+        pending = [text for text in dict.fromkeys(texts) if text not in sentiment_cache]
 
-        while unclustered:
-            # Start a new cluster with the first unclustered point
-            seed_point = unclustered.pop(0)
-            cluster_points = [seed_point]
-
-            print(
-                f"        Cluster {cluster_id}: Started with seed at {seed_point['latitude']}, {seed_point['longitude']}"
-            )
-
-            # Find all points within cluster radius of the seed
-            remaining = []
-            for point in unclustered:
-                distance = self._calculate_distance(
-                    seed_point["latitude"],
-                    seed_point["longitude"],
-                    point["latitude"],
-                    point["longitude"],
+        if pending:
+            batches = self._pack_comprehend_batches(pending)
+            for batch_number, batch in enumerate(batches, 1):
+                print(
+                    f"      Analyzing batch {batch_number} ({len(batch)} messages)..."
                 )
-                if distance <= cluster_radius_meters:
-                    cluster_points.append(point)
-                    print(f"          Added point {distance:.0f}m away")
-                else:
-                    remaining.append(point)
 
-            unclustered = remaining
-
-            print(
-                f"        Cluster {cluster_id}: Final size {len(cluster_points)} points"
-            )
-
-            # Only create location if we have enough points (reduces noise)
-            if len(cluster_points) >= 2:  # Require at least 2 points for a location
-                location = self._create_location_from_cluster(cluster_points)
-                if location:
-                    locations.append(location)
-                    print(f"        ✅ Created location from cluster {cluster_id}")
-                else:
-                    print(
-                        f"        ❌ Failed to create location from cluster {cluster_id}"
+            # Analyze the batches concurrently; map keeps results in batch order
+            with ThreadPoolExecutor(max_workers=COMPREHEND_MAX_WORKERS) as executor:
+                batch_results = list(
+                    executor.map(
+                        lambda batch: self._analyze_sentiment_batch(comprehend, batch),
+                        batches,
                     )
-            else:
-                print(
-                    f"        ⚠️  Skipping cluster {cluster_id} (too few points: {len(cluster_points)})"
                 )
 
-            cluster_id += 1
-
-        print(
-            f"      📊 Clustering complete: {len(locations)} locations from {len(location_data)} GPS points"
-        )
-        return locations
-
-    def _calculate_distance(self, lat1, lon1, lat2, lon2):
-        """Calculate distance between two points in meters using Haversine formula."""
-        lat1, lon1, lat2, lon2 = map(
-            math.radians, [float(lat1), float(lon1), float(lat2), float(lon2)]
-        )
-
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = (
-            math.sin(dlat / 2) ** 2
-            + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-        )
-        c = 2 * math.asin(math.sqrt(a))
-        r = 6371000  # Earth's radius in meters
-
-        return c * r
+            analyzed = {}
+            for batch, sentiment_results in zip(batches, batch_results):
+                for text, result in zip(batch, sentiment_results or []):
+                    if result is not None:
+                        analyzed[text] = result
 
-    def _create_location_from_cluster(self, cluster_points: list):
-        """Create a Location object from a cluster of GPS points."""
-        if not cluster_points:
-            return None
+            sentiment_cache.update(analyzed)
 
-        try:
-            # Calculate center coordinates (simple average)
-            center_lat = sum(
-                float(point["latitude"]) for point in cluster_points
-            ) / len(cluster_points)
-            center_lon = sum(
-                float(point["longitude"]) for point in cluster_points
-            ) / len(cluster_points)
-
-            # Sort by timestamp to get first and last visits
-            cluster_points.sort(key=lambda x: x["timestamp"])
-            first_visit = cluster_points[0]["timestamp"]
-            last_visit = cluster_points[-1]["timestamp"]
-
-            # Count activity types
-            activity_types = {}
-            for point in cluster_points:
-                activity = point.get("activity_type")
-                if activity:
-                    activity_types[activity] = activity_types.get(activity, 0) + 1
-
-            # Get a name (use location_name if available, otherwise use address)
-            location_name = ""
-            for point in cluster_points:
-                if point.get("location_name"):
-                    location_name = point["location_name"]
-                    break
-
-            location_address = ""
-            for point in cluster_points:
-                if point.get("address"):
-                    location_address = point["address"]
-                    break
-
-            # Estimate time spent (rough calculation based on point density)
-            total_time_minutes = len(cluster_points) * 30  # 30 minutes per GPS point
-
-            # Create Location object
-            location = Location.objects.create(
-                time_analysis=self,
-                name=location_name,
-                center_latitude=center_lat,
-                center_longitude=center_lon,
-                visit_count=len(cluster_points),
-                total_time_minutes=total_time_minutes,
-                first_visit=first_visit,
-                last_visit=last_visit,
-                address=location_address,
-                activity_types=activity_types,
-            )
+    def _pack_comprehend_batches(self, texts: list[str]) -> list[list[str]]:
+        """
+        Split texts into BatchDetectSentiment requests of up to
+        COMPREHEND_BATCH_SIZE documents. A text over Comprehend's per-document
+        size limit is sent on its own, so when Comprehend rejects the request
+        it doesn't take a full batch of valid texts down with it.
+        """
+        batches = []
+        batch = []
+        for text in texts:
+            if len(text.encode("utf-8")) > COMPREHEND_MAX_DOCUMENT_BYTES:
+                batches.append([text])
+                continue
 
-            print(f"      ✅ Created location: {location}")
-            return location
+            batch.append(text)
+            if len(batch) == COMPREHEND_BATCH_SIZE:
+                batches.append(batch)
+                batch = []
 
-        except Exception as e:
-            print(f"      ❌ Error creating location from cluster: {e}")
-            logger.error(f"Error creating location from cluster: {e}")
-            return None
+        if batch:
+            batches.append(batch)
+        return batches
 
     def _analyze_sentiment_batch(
         self, comprehend, text_list: list[str]
@@ -801,7 +966,9 @@ class TimeAnalysis(models.Model):
             # Log errors for failed items
             for error in response.get("ErrorList", []):
                 logger.error(
-                    f"Error analyzing sentiment for item {error['Index']}: {error['ErrorMessage']}"
+                    "Error analyzing sentiment for item %s: %s",
+                    error["Index"],
+                    error["ErrorMessage"],
                 )
 
             return results
@@ -810,64 +977,62 @@ class TimeAnalysis(models.Model):
             logger.error(f"Error in batch sentiment analysis: {e}")
             return [None] * len(text_list)
 
-    def _analyze_website_correlations(self, supabase: Client):
+    def _analyze_website_correlations(
+        self, supabase: Client, day_index: dict, day_sentiment: np.ndarray
+    ):
         """
         Second pass: Analyze correlation between website visits and daily sentiment scores.
+        day_index maps each analyzed date string to its position in day_sentiment.
         """
         print("🔍 Fetching browser history data...")
 
-        # Clear existing WebsiteAnalysis records for this TimeAnalysis
-        existing_website_count = WebsiteAnalysis.objects.filter(
+        # Clear existing WebsiteAnalysis records for this TimeAnalysis; delete() reports
+        # how many rows it removed, so no separate COUNT(*) is needed
+        deleted_website_count, _ = WebsiteAnalysis.objects.filter(
             time_analysis=self
-        ).count()
-        if existing_website_count > 0:
+        ).delete()
+        if deleted_website_count:
             print(
-                f"🗑️  Clearing {existing_website_count} existing WebsiteAnalysis records..."
+                f"✅ Cleared {deleted_website_count} existing WebsiteAnalysis records"
             )
-            WebsiteAnalysis.objects.filter(time_analysis=self).delete()
-            print("✅ Existing WebsiteAnalysis records cleared")
 
         # Fetch browser history for the date range
-        daily_website_visits = defaultdict(set)  # date_str -> set of domains
-        domain_example_urls = {}  # domain -> example_url
-        self._fetch_browser_history(supabase, daily_website_visits, domain_example_urls)
-
-        # Get all days with sentiment scores
-        days_with_sentiment = Day.objects.filter(
-            time_analysis=self, sentiment__isnull=False
-        ).order_by("date")
-        if not days_with_sentiment.exists():
+        daily_website_visits = defaultdict(list)  # date_str -> list of domain ids
+        domain_ids = {}  # domain -> domain id
+        domain_example_urls = []  # domain id -> example_url
+        self._fetch_browser_history(
+            supabase, daily_website_visits, domain_ids, domain_example_urls
+        )
+
+        if not day_index:
             print(
                 "❌ No days with sentiment scores found for website correlation analysis"
             )
             return
 
-        print(f"📊 Found {days_with_sentiment.count()} days with sentiment scores")
+        print(f"📊 Found {len(day_index)} days with sentiment scores")
 
-        # Collect all unique domains
-        all_domains = set()
-        for domains in daily_website_visits.values():
-            all_domains.update(domains)
+        print(f"🌐 Found {len(domain_ids)} unique website domains")
 
-        print(f"🌐 Found {len(all_domains)} unique website domains")
-
-        if not all_domains:
+        if not domain_ids:
             print("❌ No browser history data found for correlation analysis")
             return
 
-        # Calculate correlations for each domain
+        # Calculate correlations for every domain at once
+        presence_stats = self._presence_correlations(
+            day_index, day_sentiment, daily_website_visits, range(len(domain_ids))
+        )
         website_analyses = []
-        for domain in all_domains:
-            print(f"  📈 Analyzing correlation for {domain}...")
+        for domain, domain_id in domain_ids.items():
             correlation_data = self._calculate_domain_correlation(
-                domain, days_with_sentiment, daily_website_visits
+                domain, presence_stats[domain_id]
             )
 
             if correlation_data:
-                website_analysis = WebsiteAnalysis.objects.create(
+                website_analysis = WebsiteAnalysis(
                     time_analysis=self,
                     domain=domain,
-                    example_url=domain_example_urls.get(domain, ""),
+                    example_url=domain_example_urls[domain_id],
                     correlation_coefficient=correlation_data["correlation"],
                     days_visited=correlation_data["days_visited"],
                     days_not_visited=correlation_data["days_not_visited"],
@@ -882,6 +1047,9 @@ class TimeAnalysis(models.Model):
                 )
                 website_analyses.append(website_analysis)
 
+        # Insert every correlation row at once rather than one INSERT per row
+        WebsiteAnalysis.objects.bulk_create(website_analyses, batch_size=500)
+
         print(
             f"🎉 Website correlation analysis complete! Created {len(website_analyses)} WebsiteAnalysis records"
         )
@@ -910,216 +1078,200 @@ class TimeAnalysis(models.Model):
                 )
 
     def _fetch_browser_history(
-        self, supabase: Client, daily_website_visits: dict, domain_example_urls: dict
+        self,
+        supabase: Client,
+        daily_website_visits: dict,
+        domain_ids: dict,
+        domain_example_urls: list,
     ):
-        """Fetch browser history from Supabase and group by day and domain."""
+        """
+        Fetch browser history from Supabase and group by day and domain.
+        Each new domain is given the next integer id in domain_ids, and the
+        daily groups hold those ids rather than the domain strings.
+        """
         try:
-            # Convert date range to timestamps for filtering
-            start_datetime = f"{self.start_date} 00:00:00"
-            end_datetime = f"{self.end_date} 23:59:59"
-
             print(
-                f"    🌐 Querying browser history from {start_datetime} to {end_datetime}"
+                f"    🌐 Querying browser history from {self.start_date} to {self.end_date}"
             )
 
-            # Fetch browser history with pagination
-            all_visits = []
-            batch_size = 1000
-            offset = 0
+            # Days come back from the view as ISO strings, which order like dates
+            start_day = self.start_date.isoformat()
+            end_day = self.end_date.isoformat()
+
+            # Stream pages straight into the daily groups
+            visit_count = 0
+            rows = self._iter_rows(
+                supabase,
+                "browser_history_daily_sites",
+                "day, site, example_url, visits",
+                [
+                    ("gte", "day", start_day),
+                    ("lte", "day", end_day),
+                ],
+                "day",
+                "site days",
+                max_workers=BROWSER_HISTORY_FETCH_WORKERS,
+                tiebreak_column="site",
+            )
 
-            while True:
-                response = (
-                    supabase.table("browser_history")
-                    .select("url, timestamp, visit_count")
-                    .gte("timestamp", start_datetime)
-                    .lte("timestamp", end_datetime)
-                    .range(offset, offset + batch_size - 1)
-                    .execute()
-                )
+            # The view has already collapsed visits to one row per day and
+            # site (scheme plus host), so only the domain is left to derive
+            for row in rows:
+                visit_count += row["visits"]
+                domain = _extract_domain(row["site"])
+                if domain:
+                    domain_id = domain_ids.get(domain)
+                    if domain_id is None:
+                        # Store example URL for this domain (keep first occurrence)
+                        domain_id = domain_ids[domain] = len(domain_example_urls)
+                        domain_example_urls.append(row["example_url"])
 
-                if not response.data:
-                    break
+                    # A day can repeat an id when several sites share a
+                    # domain; presence is boolean, so duplicates are harmless
+                    daily_website_visits[row["day"]].append(domain_id)
 
-                all_visits.extend(response.data)
-                offset += batch_size
-
-                print(
-                    f"      Fetched batch {offset // batch_size}: {len(response.data)} visits (total: {len(all_visits)})"
-                )
-
-                if len(response.data) < batch_size:
-                    break  # No more data
-
-            print(
-                f"    🌐 Found {len(all_visits)} browser history records in date range"
-            )
-
-            # Group visits by date and extract domains
-            for visit in all_visits:
-                if visit.get("url") and visit.get("timestamp"):
-                    try:
-                        # Parse timestamp
-                        parsed_date = parse_date(visit["timestamp"]).date()
-
-                        if self.start_date <= parsed_date <= self.end_date:
-                            # Extract domain from URL
-                            domain = self._extract_domain(visit["url"])
-                            if domain:
-                                date_str = parsed_date.isoformat()
-                                daily_website_visits[date_str].add(domain)
-
-                                # Store example URL for this domain (keep first occurrence)
-                                if domain not in domain_example_urls:
-                                    domain_example_urls[domain] = visit["url"]
-
-                    except Exception as e:
-                        logger.warning(
-                            f"Error parsing browser history timestamp '{visit.get('timestamp')}': {e}"
-                        )
+            print(f"    🌐 Found {visit_count} browser history records in date range")
 
         except Exception as e:
             print(f"    ❌ Error fetching browser history: {e}")
             logger.error(f"Error fetching browser history: {e}")
 
-    def _extract_domain(self, url: str) -> str:
-        """Extract domain from URL, removing www. prefix."""
-        try:
-            parsed_url = urlparse(url)
-            domain = parsed_url.netloc.lower()
+    def _calculate_domain_correlation(self, domain: str, stats: dict):
+        """Calculate correlation between domain visits and sentiment scores."""
+        days_visited = stats["days_present"]
+        days_not_visited = stats["days_not_present"]
+        total_visits = days_visited  # Simplified - could count actual visits if needed
 
-            # Remove www. prefix
-            if domain.startswith("www."):
-                domain = domain[4:]
+        # Need at least some visits to calculate meaningful correlation
+        if days_visited < 2 or days_not_visited < 2 or total_visits < 3:
+            print(
+                f"    ⚠️  Skipping {domain}: insufficient data (visited: {days_visited}, not visited: {days_not_visited}, total visits: {total_visits})"
+            )
+            return None
 
-            return domain
-        except Exception as e:
-            logger.warning(f"Error extracting domain from URL '{url}': {e}")
-            return ""
+        correlation = stats["correlation"]
 
-    def _calculate_domain_correlation(
-        self, domain: str, days_with_sentiment, daily_website_visits: dict
-    ):
-        """Calculate correlation between domain visits and sentiment scores."""
-        try:
-            # Prepare data for correlation calculation
-            sentiment_scores = []
-            domain_presence = []  # 1 if domain visited, 0 if not
-
-            days_visited = 0
-            days_not_visited = 0
-            sentiment_when_visited = []
-            sentiment_when_not_visited = []
-            total_visits = 0
-
-            for day in days_with_sentiment:
-                date_str = day.date.isoformat()
-                sentiment_scores.append(day.sentiment)
-
-                # Check if domain was visited on this day
-                domains_visited = daily_website_visits.get(date_str, set())
-                if domain in domains_visited:
-                    domain_presence.append(1)
-                    days_visited += 1
-                    sentiment_when_visited.append(day.sentiment)
-                    total_visits += (
-                        1  # Simplified - could count actual visits if needed
-                    )
-                else:
-                    domain_presence.append(0)
-                    days_not_visited += 1
-                    sentiment_when_not_visited.append(day.sentiment)
+        # Calculate significance score (simple metric based on sample size and correlation strength)
+        significance_score = (
+            abs(correlation) * min(days_visited, days_not_visited) / 10.0
+        )
 
-            # Need at least some visits to calculate meaningful correlation
-            if days_visited < 2 or days_not_visited < 2 or total_visits < 3:
-                print(
-                    f"    ⚠️  Skipping {domain}: insufficient data (visited: {days_visited}, not visited: {days_not_visited}, total visits: {total_visits})"
-                )
-                return None
+        return {
+            "correlation": correlation,
+            "days_visited": days_visited,
+            "days_not_visited": days_not_visited,
+            "avg_sentiment_visited": stats["avg_sentiment_present"],
+            "avg_sentiment_not_visited": stats["avg_sentiment_not_present"],
+            "total_visits": total_visits,
+            "significance_score": significance_score,
+        }
 
-            # Calculate Pearson correlation coefficient
-            correlation = self._calculate_pearson_correlation(
-                sentiment_scores, domain_presence
+    def _presence_correlations(
+        self, day_index: dict, day_sentiment: np.ndarray, daily_presence: dict, keys
+    ) -> dict:
+        """
+        Correlate day sentiment with the presence of each key (a domain,
+        contact or location id) across the analyzed days. day_index maps each
+        day key (a date string, or a day offset for places) to its position in
+        day_sentiment.
+
+        daily_presence maps a day key to the keys present that day. All
+        keys are scored together from one boolean presence matrix, so each statistic
+        is a single matrix-vector product rather than a Python loop per key.
+        Returns, per key, its Pearson correlation, the number of days it was
+        present and absent, and the average sentiment on each kind of day.
+        """
+        keys = list(keys)
+        key_index = {key: i for i, key in enumerate(keys)}
+        n = len(day_sentiment)
+
+        # Flatten every (key, day) pair into two integer index arrays so the
+        # whole presence matrix is filled by a single fancy-indexed assignment
+        rows = []
+        columns = []
+        for date_str, present_keys in daily_presence.items():
+            column = day_index.get(date_str)
+            if column is None:
+                continue
+            for key in present_keys:
+                row = key_index.get(key)
+                if row is not None:
+                    rows.append(row)
+                    columns.append(column)
+
+        presence = np.zeros((len(keys), n), dtype=np.bool_)
+        presence[
+            np.asarray(rows, dtype=np.intp), np.asarray(columns, dtype=np.intp)
+        ] = True
+
+        days_present = presence.sum(axis=1)
+        days_not_present = n - days_present
+        sentiment_present = presence @ day_sentiment
+        sentiment_total = day_sentiment.sum()
+        sentiment_not_present = sentiment_total - sentiment_present
+
+        # Pearson's r on mean-centred sentiment, which avoids the cancellation
+        # of the raw-sum formula. Centred sentiment sums to zero, so its product
+        # with the uncentred presence is already the covariance sum, and a 0/1
+        # row's centred sum of squares is present * absent / n.
+        centred = day_sentiment - day_sentiment.mean()
+        numerator = presence @ centred
+        denominator = np.sqrt((centred @ centred) * days_present * days_not_present / n)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlation = np.where(denominator > 0, numerator / denominator, 0.0)
+            avg_present = np.where(
+                days_present > 0, sentiment_present / days_present, 0.0
             )
-
-            # Calculate significance score (simple metric based on sample size and correlation strength)
-            significance_score = (
-                abs(correlation) * min(days_visited, days_not_visited) / 10.0
+            avg_not_present = np.where(
+                days_not_present > 0, sentiment_not_present / days_not_present, 0.0
             )
 
-            return {
-                "correlation": correlation,
-                "days_visited": days_visited,
-                "days_not_visited": days_not_visited,
-                "avg_sentiment_visited": sum(sentiment_when_visited)
-                / len(sentiment_when_visited)
-                if sentiment_when_visited
-                else 0,
-                "avg_sentiment_not_visited": sum(sentiment_when_not_visited)
-                / len(sentiment_when_not_visited)
-                if sentiment_when_not_visited
-                else 0,
-                "total_visits": total_visits,
-                "significance_score": significance_score,
+        return {
+            key: {
+                "correlation": float(correlation[i]),
+                "days_present": int(days_present[i]),
+                "days_not_present": int(days_not_present[i]),
+                "avg_sentiment_present": float(avg_present[i]),
+                "avg_sentiment_not_present": float(avg_not_present[i]),
             }
+            for i, key in enumerate(keys)
+        }
 
-        except Exception as e:
-            logger.error(f"Error calculating correlation for domain {domain}: {e}")
-            return None
-
-    def _calculate_pearson_correlation(self, x: list, y: list) -> float:
-        """Calculate Pearson correlation coefficient between two lists."""
-        if len(x) != len(y) or len(x) < 2:
-            return 0.0
-
-        n = len(x)
-        sum_x = sum(x)
-        sum_y = sum(y)
-        sum_x_sq = sum(xi * xi for xi in x)
-        sum_y_sq = sum(yi * yi for yi in y)
-        sum_xy = sum(xi * yi for xi, yi in zip(x, y))
-
-        numerator = n * sum_xy - sum_x * sum_y
-        denominator = math.sqrt(
-            (n * sum_x_sq - sum_x * sum_x) * (n * sum_y_sq - sum_y * sum_y)
-        )
-
-        if denominator == 0:
-            return 0.0
-
-        return numerator / denominator
-
-    def _analyze_person_correlations(self, daily_messages: dict):
+    def _analyze_person_correlations(
+        self,
+        daily_person_interactions: dict,
+        day_index: dict,
+        day_sentiment: np.ndarray,
+    ):
         """
         Third pass: Analyze correlation between interacting with specific people and daily sentiment scores.
+        daily_person_interactions maps each date string to the contacts messaged
+        that day, and day_index maps it to its position in day_sentiment.
         """
         print("🔍 Analyzing person interaction data...")
 
-        # Clear existing PersonAnalysis records for this TimeAnalysis
-        existing_person_count = PersonAnalysis.objects.filter(
+        # Clear existing PersonAnalysis records for this TimeAnalysis; delete() reports
+        # how many rows it removed, so no separate COUNT(*) is needed
+        deleted_person_count, _ = PersonAnalysis.objects.filter(
             time_analysis=self
-        ).count()
-        if existing_person_count > 0:
-            print(
-                f"🗑️  Clearing {existing_person_count} existing PersonAnalysis records..."
-            )
-            PersonAnalysis.objects.filter(time_analysis=self).delete()
-            print("✅ Existing PersonAnalysis records cleared")
-
-        # Extract person interactions from the daily_messages that were already fetched
-        daily_person_interactions = defaultdict(set)  # date_str -> set of contact names
-        self._extract_person_interactions(daily_messages, daily_person_interactions)
-
-        # Get all days with sentiment scores
-        days_with_sentiment = Day.objects.filter(
-            time_analysis=self, sentiment__isnull=False
-        ).order_by("date")
-        if not days_with_sentiment.exists():
+        ).delete()
+        if deleted_person_count:
+            print(f"✅ Cleared {deleted_person_count} existing PersonAnalysis records")
+
+        total_interactions = sum(
+            len(contacts) for contacts in daily_person_interactions.values()
+        )
+        print(
+            f"    👥 Extracted {total_interactions} person interactions across {len(daily_person_interactions)} days"
+        )
+
+        if not day_index:
             print(
                 "❌ No days with sentiment scores found for person correlation analysis"
             )
             return
 
-        print(f"📊 Found {days_with_sentiment.count()} days with sentiment scores")
+        print(f"📊 Found {len(day_index)} days with sentiment scores")
 
         # Collect all unique contacts
         all_contacts = set()
@@ -1132,16 +1284,18 @@ class TimeAnalysis(models.Model):
             print("❌ No contact interaction data found for correlation analysis")
             return
 
-        # Calculate correlations for each contact
+        # Calculate correlations for every contact at once
+        presence_stats = self._presence_correlations(
+            day_index, day_sentiment, daily_person_interactions, all_contacts
+        )
         person_analyses = []
         for contact in all_contacts:
-            print(f"  📈 Analyzing correlation for {contact}...")
             correlation_data = self._calculate_person_correlation(
-                contact, days_with_sentiment, daily_person_interactions
+                contact, presence_stats[contact]
             )
 
             if correlation_data:
-                person_analysis = PersonAnalysis.objects.create(
+                person_analysis = PersonAnalysis(
                     time_analysis=self,
                     contact_name=contact,
                     correlation_coefficient=correlation_data["correlation"],
@@ -1158,6 +1312,9 @@ class TimeAnalysis(models.Model):
                 )
                 person_analyses.append(person_analysis)
 
+        # Insert every correlation row at once rather than one INSERT per row
+        PersonAnalysis.objects.bulk_create(person_analyses, batch_size=500)
+
         print(
             f"🎉 Person correlation analysis complete! Created {len(person_analyses)} PersonAnalysis records"
         )
@@ -1185,174 +1342,94 @@ class TimeAnalysis(models.Model):
                     f"  🔴 {pa.contact_name}: {pa.correlation_coefficient:.3f} (interacted {pa.days_interacted} days)"
                 )
 
-    def _extract_person_interactions(
-        self, daily_messages: dict, daily_person_interactions: dict
-    ):
-        """Extract person interactions from the daily messages that were already fetched."""
-        print("    👥 Extracting person interactions from message data...")
-
-        for date_str, message_list in daily_messages.items():
-            contacts_for_day = set()
-
-            for message in message_list:
-                contact = message.get("contact", "").strip()
-                if contact and contact != "Unknown" and contact != "":
-                    # Normalize contact names
-                    contact = self._normalize_contact_name(contact)
-                    if contact:
-                        contacts_for_day.add(contact)
-
-            if contacts_for_day:
-                daily_person_interactions[date_str] = contacts_for_day
-                print(f"      {date_str}: {len(contacts_for_day)} unique contacts")
-
-        total_interactions = sum(
-            len(contacts) for contacts in daily_person_interactions.values()
-        )
-        print(
-            f"    👥 Extracted {total_interactions} person interactions across {len(daily_person_interactions)} days"
-        )
+    def _extract_day_contacts(self, message_list: list) -> set:
+        """Return the normalized contact names messaged in one day's messages."""
+        contacts_for_day = set()
 
-    def _normalize_contact_name(self, contact: str) -> str:
-        """Normalize contact names for consistent matching."""
-        if not contact or contact.strip() == "":
-            return ""
-
-        contact = contact.strip()
-
-        # Skip generic/system contacts
-        skip_contacts = {
-            "unknown",
-            "me",
-            "",
-            "system",
-            "group",
-            "chat",
-            "whatsapp",
-            "imessage",
-            "sms",
-            "mms",
-        }
-
-        if contact.lower() in skip_contacts:
-            return ""
-
-        # For WhatsApp group names, extract meaningful part
-        if " group" in contact.lower() or "group " in contact.lower():
-            # Keep group names but clean them up
-            contact = contact.replace(" Group", "").replace(" group", "")
+        for message in message_list:
+            contact = message.get("contact", "").strip()
+            if contact and contact != "Unknown" and contact != "":
+                # Normalize contact names
+                contact = _normalize_contact_name(contact)
+                if contact:
+                    contacts_for_day.add(contact)
 
-        return contact
+        return contacts_for_day
 
-    def _calculate_person_correlation(
-        self, contact: str, days_with_sentiment, daily_person_interactions: dict
-    ):
+    def _calculate_person_correlation(self, contact: str, stats: dict):
         """Calculate correlation between interacting with a person and sentiment scores."""
-        try:
-            # Prepare data for correlation calculation
-            sentiment_scores = []
-            person_interaction = []  # 1 if interacted with person, 0 if not
-
-            days_interacted = 0
-            days_not_interacted = 0
-            sentiment_when_interacted = []
-            sentiment_when_not_interacted = []
-            total_messages = 0
-
-            for day in days_with_sentiment:
-                date_str = day.date.isoformat()
-                sentiment_scores.append(day.sentiment)
-
-                # Check if we interacted with this person on this day
-                contacts_for_day = daily_person_interactions.get(date_str, set())
-                if contact in contacts_for_day:
-                    person_interaction.append(1)
-                    days_interacted += 1
-                    sentiment_when_interacted.append(day.sentiment)
-                    total_messages += (
-                        1  # Simplified - could count actual messages if needed
-                    )
-                else:
-                    person_interaction.append(0)
-                    days_not_interacted += 1
-                    sentiment_when_not_interacted.append(day.sentiment)
+        days_interacted = stats["days_present"]
+        days_not_interacted = stats["days_not_present"]
 
-            # Need at least some interactions to calculate meaningful correlation
-            if days_interacted < 2 or days_not_interacted < 2:
-                print(
-                    f"    ⚠️  Skipping {contact}: insufficient data (interacted: {days_interacted}, not interacted: {days_not_interacted})"
-                )
-                return None
-
-            # Calculate Pearson correlation coefficient
-            correlation = self._calculate_pearson_correlation(
-                sentiment_scores, person_interaction
+        # Need at least some interactions to calculate meaningful correlation
+        if days_interacted < 2 or days_not_interacted < 2:
+            print(
+                f"    ⚠️  Skipping {contact}: insufficient data (interacted: {days_interacted}, not interacted: {days_not_interacted})"
             )
+            return None
 
-            # Calculate significance score (simple metric based on sample size and correlation strength)
-            significance_score = (
-                abs(correlation) * min(days_interacted, days_not_interacted) / 10.0
-            )
+        correlation = stats["correlation"]
 
-            return {
-                "correlation": correlation,
-                "days_interacted": days_interacted,
-                "days_not_interacted": days_not_interacted,
-                "avg_sentiment_interacted": sum(sentiment_when_interacted)
-                / len(sentiment_when_interacted)
-                if sentiment_when_interacted
-                else 0,
-                "avg_sentiment_not_interacted": sum(sentiment_when_not_interacted)
-                / len(sentiment_when_not_interacted)
-                if sentiment_when_not_interacted
-                else 0,
-                "total_messages": total_messages,
-                "significance_score": significance_score,
-            }
+        # Calculate significance score (simple metric based on sample size and correlation strength)
+        significance_score = (
+            abs(correlation) * min(days_interacted, days_not_interacted) / 10.0
+        )
 
-        except Exception as e:
-            logger.error(f"Error calculating correlation for contact {contact}: {e}")
-            return None
+        return {
+            "correlation": correlation,
+            "days_interacted": days_interacted,
+            "days_not_interacted": days_not_interacted,
+            "avg_sentiment_interacted": stats["avg_sentiment_present"],
+            "avg_sentiment_not_interacted": stats["avg_sentiment_not_present"],
+            # Simplified - could count actual messages if needed
+            "total_messages": days_interacted,
+            "significance_score": significance_score,
+        }
 
-    def _analyze_place_correlations(self):
+    def _analyze_place_correlations(self, day_index: dict, day_sentiment: np.ndarray):
         """
         Fourth pass: Analyze correlation between being at specific places and daily sentiment scores.
+        day_index maps each analyzed date string to its position in day_sentiment.
         """
         print("🔍 Analyzing place correlation data...")
 
-        # Clear existing PlaceAnalysis records for this TimeAnalysis
-        existing_place_count = PlaceAnalysis.objects.filter(time_analysis=self).count()
-        if existing_place_count > 0:
-            print(
-                f"🗑️  Clearing {existing_place_count} existing PlaceAnalysis records..."
-            )
-            PlaceAnalysis.objects.filter(time_analysis=self).delete()
-            print("✅ Existing PlaceAnalysis records cleared")
-
-        # Get all days with sentiment scores
-        days_with_sentiment = Day.objects.filter(
-            time_analysis=self, sentiment__isnull=False
-        ).order_by("date")
-        if not days_with_sentiment.exists():
+        # Clear existing PlaceAnalysis records for this TimeAnalysis; delete() reports
+        # how many rows it removed, so no separate COUNT(*) is needed
+        deleted_place_count, _ = PlaceAnalysis.objects.filter(
+            time_analysis=self
+        ).delete()
+        if deleted_place_count:
+            print(f"✅ Cleared {deleted_place_count} existing PlaceAnalysis records")
+
+        if not day_index:
             print(
                 "❌ No days with sentiment scores found for place correlation analysis"
             )
             return
 
-        print(f"📊 Found {days_with_sentiment.count()} days with sentiment scores")
-
-        # Get all locations for this time analysis
-        locations = Location.objects.filter(time_analysis=self)
-        if not locations.exists():
+        print(f"📊 Found {len(day_index)} days with sentiment scores")
+
+        # Get all locations for this time analysis in one query, loading only the
+        # columns presence and reporting use
+        locations = list(
+            Location.objects.filter(time_analysis=self).only(
+                "id",
+                "name",
+                "visit_count",
+                "total_time_minutes",
+                "first_visit",
+                "last_visit",
+            )
+        )
+        if not locations:
             print("❌ No location data found for correlation analysis")
             return
 
-        print(f"📍 Found {locations.count()} locations")
+        print(f"📍 Found {len(locations)} locations")
+        locations_by_id = {location.pk: location for location in locations}
 
         # Extract daily place presence from location data
-        daily_place_presence = self._extract_daily_place_presence(
-            locations, days_with_sentiment
-        )
+        daily_place_presence = self._extract_daily_place_presence(locations)
 
         # Collect all unique location IDs
         all_location_ids = set()
@@ -1365,19 +1442,27 @@ class TimeAnalysis(models.Model):
             print("❌ No location presence data found for correlation analysis")
             return
 
-        # Calculate correlations for each location
+        # Place presence is keyed by day offset from the start of the period,
+        # so re-key the day index the same way once
+        period_start = self.start_date.toordinal()
+        offset_index = {
+            date.fromisoformat(date_str).toordinal() - period_start: column
+            for date_str, column in day_index.items()
+        }
+
+        # Calculate correlations for every location at once
+        presence_stats = self._presence_correlations(
+            offset_index, day_sentiment, daily_place_presence, all_location_ids
+        )
         place_analyses = []
         for location_id in all_location_ids:
-            location = locations.get(id=location_id)
-            print(
-                f"  📈 Analyzing correlation for {location.name or f'Location {location_id}'}..."
-            )
+            location = locations_by_id[location_id]
             correlation_data = self._calculate_place_correlation(
-                location, days_with_sentiment, daily_place_presence
+                location, presence_stats[location_id]
             )
 
             if correlation_data:
-                place_analysis = PlaceAnalysis.objects.create(
+                place_analysis = PlaceAnalysis(
                     time_analysis=self,
                     location=location,
                     correlation_coefficient=correlation_data["correlation"],
@@ -1394,6 +1479,9 @@ class TimeAnalysis(models.Model):
                 )
                 place_analyses.append(place_analysis)
 
+        # Insert every correlation row at once rather than one INSERT per row
+        PlaceAnalysis.objects.bulk_create(place_analyses, batch_size=500)
+
         print(
             f"🎉 Place correlation analysis complete! Created {len(place_analyses)} PlaceAnalysis records"
         )
@@ -1423,11 +1511,16 @@ class TimeAnalysis(models.Model):
                     f"  🔴 {location_name}: {pa.correlation_coefficient:.3f} (present {pa.days_present} days)"
                 )
 
-    def _extract_daily_place_presence(self, locations, days_with_sentiment):
+    def _extract_daily_place_presence(self, locations):
         """Extract daily place presence from location data."""
         print("    📍 Extracting daily place presence from location data...")
 
-        daily_place_presence = defaultdict(set)  # date_str -> set of location_ids
+        # day offset from start_date -> list of location_ids; a location's marked
+        # offsets are strictly increasing, so it is appended to any one day at most once
+        daily_place_presence = defaultdict(list)
+
+        period_start = self.start_date.toordinal()
+        period_length = self.end_date.toordinal() - period_start + 1
 
         for location in locations:
             # For each location, determine which days the user was present
@@ -1440,6 +1533,7 @@ class TimeAnalysis(models.Model):
             # Convert to dates
             first_date = location.first_visit.date()
             last_date = location.last_visit.date()
+            first_ordinal = first_date.toordinal()
 
             # For simplicity, we'll assume the user was at this location on days
             # proportional to their visit count and total time
@@ -1459,17 +1553,19 @@ class TimeAnalysis(models.Model):
                 # based on visit count and time distribution
                 days_to_mark = min(location.visit_count, total_days_in_period)
 
-                # Distribute days evenly across the period
+                # Distribute days evenly across the period, all at once
                 if days_to_mark > 0:
-                    for i in range(days_to_mark):
-                        # Calculate which day to mark (spread evenly)
-                        day_offset = int(i * total_days_in_period / days_to_mark)
-                        target_date = first_date + timedelta(days=day_offset)
-
-                        # Only mark if this date is within our analysis period
-                        if self.start_date <= target_date <= self.end_date:
-                            date_str = target_date.isoformat()
-                            daily_place_presence[date_str].add(location.pk)
+                    day_offsets = (
+                        np.arange(days_to_mark) * total_days_in_period / days_to_mark
+                    ).astype(np.int64)
+                    period_offsets = day_offsets + (first_ordinal - period_start)
+
+                    # Only mark dates within our analysis period; the offsets
+                    # are ascending, so the in-range run is found by binary search
+                    lo = np.searchsorted(period_offsets, 0)
+                    hi = np.searchsorted(period_offsets, period_length)
+                    for offset in period_offsets[lo:hi].tolist():
+                        daily_place_presence[offset].append(location.pk)
 
         total_presence_records = sum(
             len(location_ids) for location_ids in daily_place_presence.values()
@@ -1480,76 +1576,35 @@ class TimeAnalysis(models.Model):
 
         return daily_place_presence
 
-    def _calculate_place_correlation(
-        self, location, days_with_sentiment, daily_place_presence: dict
-    ):
+    def _calculate_place_correlation(self, location, stats: dict):
         """Calculate correlation between being at a specific place and sentiment scores."""
-        try:
-            # Prepare data for correlation calculation
-            sentiment_scores = []
-            place_presence = []  # 1 if present at place, 0 if not
-
-            days_present = 0
-            days_not_present = 0
-            sentiment_when_present = []
-            sentiment_when_not_present = []
-            total_visits = location.visit_count
-
-            for day in days_with_sentiment:
-                date_str = day.date.isoformat()
-                sentiment_scores.append(day.sentiment)
-
-                # Check if we were at this place on this day
-                location_ids_for_day = daily_place_presence.get(date_str, set())
-                if location.pk in location_ids_for_day:
-                    place_presence.append(1)
-                    days_present += 1
-                    sentiment_when_present.append(day.sentiment)
-                else:
-                    place_presence.append(0)
-                    days_not_present += 1
-                    sentiment_when_not_present.append(day.sentiment)
-
-            # Need at least some presence data to calculate meaningful correlation
-            if days_present < 2 or days_not_present < 2:
-                location_name = location.name or f"Location {location.pk}"
-                print(
-                    f"    ⚠️  Skipping {location_name}: insufficient data (present: {days_present}, not present: {days_not_present})"
-                )
-                return None
+        days_present = stats["days_present"]
+        days_not_present = stats["days_not_present"]
 
-            # Calculate Pearson correlation coefficient
-            correlation = self._calculate_pearson_correlation(
-                sentiment_scores, place_presence
+        # Need at least some presence data to calculate meaningful correlation
+        if days_present < 2 or days_not_present < 2:
+            location_name = location.name or f"Location {location.pk}"
+            print(
+                f"    ⚠️  Skipping {location_name}: insufficient data (present: {days_present}, not present: {days_not_present})"
             )
+            return None
 
-            # Calculate significance score (simple metric based on sample size and correlation strength)
-            significance_score = (
-                abs(correlation) * min(days_present, days_not_present) / 10.0
-            )
+        correlation = stats["correlation"]
 
-            return {
-                "correlation": correlation,
-                "days_present": days_present,
-                "days_not_present": days_not_present,
-                "avg_sentiment_present": sum(sentiment_when_present)
-                / len(sentiment_when_present)
-                if sentiment_when_present
-                else 0,
-                "avg_sentiment_not_present": sum(sentiment_when_not_present)
-                / len(sentiment_when_not_present)
-                if sentiment_when_not_present
-                else 0,
-                "total_visits": total_visits,
-                "significance_score": significance_score,
-            }
+        # Calculate significance score (simple metric based on sample size and correlation strength)
+        significance_score = (
+            abs(correlation) * min(days_present, days_not_present) / 10.0
+        )
 
-        except Exception as e:
-            location_name = location.name or f"Location {location.pk}"
-            logger.error(
-                f"Error calculating correlation for location {location_name}: {e}"
-            )
-            return None
+        return {
+            "correlation": correlation,
+            "days_present": days_present,
+            "days_not_present": days_not_present,
+            "avg_sentiment_present": stats["avg_sentiment_present"],
+            "avg_sentiment_not_present": stats["avg_sentiment_not_present"],
+            "total_visits": location.visit_count,
+            "significance_score": significance_score,
+        }
 
 
 class Day(models.Model):
@@ -1572,6 +1627,10 @@ class Day(models.Model):
         verbose_name_plural = "Days"
         ordering = ["date"]
         unique_together = ["time_analysis", "date"]
+        indexes = (
+            models.Index(fields=["sentiment"]),
+            models.Index(fields=["message_count"]),
+        )
 
     def __str__(self):
         return f"{self.date} - Sentiment: {self.sentiment:.2f}"
@@ -1633,8 +1692,17 @@ class Message(models.Model):
         verbose_name = "Message"
         verbose_name_plural = "Messages"
         ordering = ["-sentiment"]  # Default to happiest first
+        indexes = (
+            models.Index(fields=["-sentiment", "-created_at"]),
+            models.Index(fields=["-created_at"]),
+            models.Index(fields=["day", "source"]),
+            models.Index(fields=["day", "sentiment"]),
+        )
 
     def __str__(self):
+        # Don't trigger a query per row when the text column was deferred
+        if "text" in self.get_deferred_fields():
+            return f"{self.source} - {self.sentiment:.2f}"
         preview = self.text[:50] + "..." if len(self.text) > 50 else self.text
         return f"{self.source} - {self.sentiment:.2f} - {preview}"
 
@@ -1692,6 +1760,7 @@ class Location(models.Model):
         verbose_name = "Location"
         verbose_name_plural = "Locations"
         ordering = ["-visit_count"]
+        indexes = (models.Index(fields=["-visit_count"]),)
 
     def __str__(self):
         name = self.name or f"{self.center_latitude}, {self.center_longitude}"
@@ -1747,6 +1816,7 @@ class WebsiteAnalysis(models.Model):
         verbose_name = "Website Analysis"
         verbose_name_plural = "Website Analyses"
         ordering = ["-correlation_coefficient"]
+        indexes = (models.Index(fields=["-correlation_coefficient"]),)
 
     def __str__(self):
         return f"{self.domain} - Correlation: {self.correlation_coefficient:.3f} (visited {self.days_visited} days)"
@@ -1786,6 +1856,7 @@ class PersonAnalysis(models.Model):
         verbose_name = "Person Analysis"
         verbose_name_plural = "Person Analyses"
         ordering = ["-correlation_coefficient"]
+        indexes = (models.Index(fields=["-correlation_coefficient"]),)
 
     def __str__(self):
         return f"{self.contact_name} - Correlation: {self.correlation_coefficient:.3f} (interacted {self.days_interacted} days)"
@@ -1829,6 +1900,7 @@ class PlaceAnalysis(models.Model):
         verbose_name = "Place Analysis"
         verbose_name_plural = "Place Analyses"
         ordering = ["-correlation_coefficient"]
+        indexes = (models.Index(fields=["-correlation_coefficient"]),)
 
     def __str__(self):
         location_name = self.location.name or f"Location {self.location.pk}"
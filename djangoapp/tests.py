@@ -1,3 +1,341 @@
-from django.test import TestCase
+import math
+import os
+import tempfile
+from datetime import date
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+import orjson
+from django.contrib import admin
+from django.test import RequestFactory, TestCase
+
+from databases.helpers import save_data_to_jsonl
+
+from . import location_clustering
+from .admin import CorrelationBucketFilter, SignificanceBucketFilter
+from .location_clustering import _detect_segments, _detect_segments_parallel
+from .models import Day, Message, PersonAnalysis, TimeAnalysis
+
+
+def make_analysis(**kwargs):
+    """Create a TimeAnalysis without triggering the sentiment analysis."""
+    fields = {
+        "name": "Test",
+        "start_date": date(2024, 1, 1),
+        "end_date": date(2024, 1, 31),
+        "status": "completed",
+    }
+    fields.update(kwargs)
+    return TimeAnalysis.objects.create(**fields)
+
+
+class InsertMessagesTests(TestCase):
+    """_insert_messages on a database without COPY support (bulk_create)."""
+
+    def test_inserts_every_analyzed_message(self):
+        analysis = make_analysis()
+        day = Day.objects.create(
+            time_analysis=analysis, date=date(2024, 1, 2), sentiment=0.0
+        )
+        analyzed_messages = [
+            (
+                {
+                    "text": "hello",
+                    "source": "iMessage",
+                    "contact": "Alice",
+                    "timestamp": "2024-01-02 09:00:00",
+                },
+                0.5,
+            ),
+            (
+                {
+                    "text": "bye",
+                    "source": "WhatsApp",
+                    "contact": "Bob",
+                    "timestamp": "2024-01-02T18:30:00+00:00",
+                },
+                -0.25,
+            ),
+            ({"text": "no contact", "source": "iMessage", "timestamp": "t"}, 0.0),
+        ]
+
+        analysis._insert_messages(day, analyzed_messages)
+
+        rows = list(
+            Message.objects.filter(day=day)
+            .order_by("pk")
+            .values_list("text", "sentiment", "source", "contact", "timestamp")
+        )
+        self.assertEqual(
+            rows,
+            [
+                ("hello", 0.5, "iMessage", "Alice", "2024-01-02 09:00:00"),
+                ("bye", -0.25, "WhatsApp", "Bob", "2024-01-02T18:30:00+00:00"),
+                ("no contact", 0.0, "iMessage", "", "t"),
+            ],
+        )
+
+
+def random_trail(seed, point_count, jump_every=None):
+    """Random walk in radians with microsecond timestamps a few minutes apart."""
+    rng = np.random.default_rng(seed)
+    steps = rng.choice([0.0002, 0.0005, 0.001, 0.003], size=point_count)
+    lat_steps = rng.normal(0, steps)
+    lon_steps = rng.normal(0, steps)
+    if jump_every:
+        # Occasional jumps of several kilometres give the trail places to be cut
+        lat_steps[::jump_every] += 0.05
+    latitudes = 40 + np.cumsum(lat_steps)
+    longitudes = -74 + np.cumsum(lon_steps)
+    minutes = np.cumsum(rng.integers(1, 7, size=point_count))
+    return (
+        np.radians(latitudes),
+        np.radians(longitudes),
+        minutes.astype(np.int64) * 60 * 1_000_000,
+    )
+
+
+def reference_segments(lat_rad, lon_rad, ts_us, distance_threshold, time_threshold_us):
+    """The plain point-by-point stay scan the vectorized kernel replaces."""
+
+    def distance(i, j):
+        a = (
+            math.sin((lat_rad[j] - lat_rad[i]) / 2) ** 2
+            + math.cos(lat_rad[i])
+            * math.cos(lat_rad[j])
+            * math.sin((lon_rad[j] - lon_rad[i]) / 2) ** 2
+        )
+        return 2 * math.asin(math.sqrt(a)) * location_clustering.EARTH_RADIUS_METERS
+
+    segments = []
+    i = 0
+    while i < len(lat_rad):
+        j = i + 1
+        while j < len(lat_rad) and distance(i, j) <= distance_threshold:
+            j += 1
+        if j > i + 1 and ts_us[j - 1] - ts_us[i] >= time_threshold_us:
+            segments.append([i, j])
+        i = max(i + 1, j)
+    return segments
+
+
+class StayDetectionTests(TestCase):
+    """The stay detection kernels against a straightforward scan."""
+
+    DISTANCE_THRESHOLD = 100
+    TIME_THRESHOLD_US = 10 * 60 * 1_000_000
+
+    def test_matches_reference_scan(self):
+        for seed in range(50):
+            trail = random_trail(seed, 120)
+            self.assertEqual(
+                _detect_segments(
+                    *trail, self.DISTANCE_THRESHOLD, self.TIME_THRESHOLD_US
+                ).tolist(),
+                reference_segments(
+                    *trail, self.DISTANCE_THRESHOLD, self.TIME_THRESHOLD_US
+                ),
+                f"seed {seed}",
+            )
+
+    def test_parallel_matches_serial(self):
+        trail = random_trail(0, 2000, jump_every=150)
+        serial = _detect_segments(
+            *trail, self.DISTANCE_THRESHOLD, self.TIME_THRESHOLD_US
+        )
+        with mock.patch.object(location_clustering, "PARALLEL_STAY_MIN_POINTS", 0):
+            parallel = _detect_segments_parallel(
+                *trail, self.DISTANCE_THRESHOLD, self.TIME_THRESHOLD_US, 2
+            )
+        self.assertGreater(len(serial), 0)
+        self.assertEqual(parallel.tolist(), serial.tolist())
+
+
+class PresenceCorrelationTests(TestCase):
+    """_presence_correlations against numpy's own statistics."""
+
+    def test_matches_corrcoef(self):
+        rng = np.random.default_rng(0)
+        day_count = 30
+        day_keys = [f"2024-01-{day:02d}" for day in range(1, day_count + 1)]
+        day_index = {key: i for i, key in enumerate(day_keys)}
+        day_sentiment = rng.uniform(-1, 1, size=day_count)
+        presence = rng.random((4, day_count)) < 0.4
+        keys = ["a", "b", "c", "d", "always", "never"]
+
+        daily_presence = {key: set() for key in day_keys}
+        for row, key in enumerate(keys[:4]):
+            for column in np.flatnonzero(presence[row]).tolist():
+                daily_presence[day_keys[column]].add(key)
+        for present_keys in daily_presence.values():
+            present_keys.add("always")
+        # Days outside the analysis are ignored
+        daily_presence["2023-12-31"] = {"never"}
+
+        results = make_analysis()._presence_correlations(
+            day_index, day_sentiment, daily_presence, keys
+        )
+
+        for row, key in enumerate(keys[:4]):
+            result = results[key]
+            self.assertAlmostEqual(
+                result["correlation"],
+                np.corrcoef(presence[row], day_sentiment)[0, 1],
+            )
+            self.assertEqual(result["days_present"], presence[row].sum())
+            self.assertEqual(
+                result["days_not_present"], day_count - presence[row].sum()
+            )
+            self.assertAlmostEqual(
+                result["avg_sentiment_present"], day_sentiment[presence[row]].mean()
+            )
+            self.assertAlmostEqual(
+                result["avg_sentiment_not_present"],
+                day_sentiment[~presence[row]].mean(),
+            )
+
+        # A key with no variation has no correlation rather than NaN
+        self.assertEqual(results["always"]["correlation"], 0.0)
+        self.assertEqual(results["always"]["days_not_present"], 0)
+        self.assertEqual(results["never"]["correlation"], 0.0)
+        self.assertEqual(results["never"]["days_present"], 0)
+
+
+class BucketFilterTests(TestCase):
+    """The admin correlation and significance bands, edges included."""
+
+    @classmethod
+    def setUpTestData(cls):
+        analysis = make_analysis()
+        for value in (0.6, 0.5, 0.3, 0.2, 0.0, -0.2, -0.3, -0.5, -0.6):
+            PersonAnalysis.objects.create(
+                time_analysis=analysis,
+                contact_name=str(value),
+                correlation_coefficient=value,
+                days_interacted=1,
+                days_not_interacted=1,
+                avg_sentiment_when_interacted=0.0,
+                avg_sentiment_when_not_interacted=0.0,
+                total_messages=1,
+                significance_score=abs(value) * 2,
+            )
+
+    def filtered(self, filter_class, value):
+        request = RequestFactory().get("/")
+        list_filter = filter_class(
+            request,
+            {filter_class.parameter_name: [value]},
+            PersonAnalysis,
+            admin.site._registry[PersonAnalysis],
+        )
+        queryset = list_filter.queryset(request, PersonAnalysis.objects.all())
+        return sorted(
+            queryset.values_list("correlation_coefficient", flat=True), reverse=True
+        )
+
+    def test_correlation_buckets(self):
+        expected = {
+            "vp": [0.6, 0.5],
+            "p": [0.3, 0.2],
+            "n": [0.0, -0.2],
+            "neg": [-0.3, -0.5],
+            "vn": [-0.6],
+        }
+        for value, coefficients in expected.items():
+            self.assertEqual(
+                self.filtered(CorrelationBucketFilter, value), coefficients, value
+            )
+
+    def test_significance_buckets(self):
+        expected = {
+            "high": [0.6, 0.5, -0.5, -0.6],
+            "medium": [0.3, 0.2, -0.2, -0.3],
+            "low": [0.0],
+        }
+        for value, coefficients in expected.items():
+            self.assertEqual(
+                self.filtered(SignificanceBucketFilter, value), coefficients, value
+            )
+
+
+class SaveDataToJsonlTests(TestCase):
+    """save_data_to_jsonl writes one record per line after the metadata."""
+
+    def test_round_trip(self):
+        records = [
+            {"text": "héllo 👋", "count": 1, "tags": ["a", "b"]},
+            {"text": None, "count": 2.5, "nested": {"key": "value"}},
+        ]
+        metadata = {"source": "test", "total": len(records)}
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            filename = save_data_to_jsonl(
+                records, "messages", data_dir=data_dir, metadata=metadata
+            )
+            self.assertEqual(os.path.dirname(filename), data_dir)
+            self.assertTrue(os.path.basename(filename).startswith("messages_2_"))
+            with open(filename, "rb") as f:
+                lines = [orjson.loads(line) for line in f]
+
+        self.assertEqual(lines, [metadata, *records])
+
+
+class FakeQuery:
+    """Just enough of a postgrest query builder for _iter_rows."""
+
+    def __init__(self, rows, count):
+        self.rows = rows
+        self.count = count
+        self.requested = None
+
+    def select(self, columns, count=None):
+        self.requested = count
+        return self
+
+    def gte(self, column, value):
+        return self
+
+    def order(self, column):
+        return self
+
+    def range(self, start, end):
+        self.start = start
+        self.end = end
+        return self
+
+    def execute(self):
+        count = self.count if self.requested else None
+        return SimpleNamespace(data=self.rows[self.start : self.end + 1], count=count)
+
+
+class IterRowsTests(TestCase):
+    """_iter_rows pages through every row with and without a row count."""
+
+    def iter_rows(self, row_count, count, max_workers):
+        rows = [{"id": i} for i in range(row_count)]
+        supabase = mock.Mock()
+        supabase.table.side_effect = lambda table: FakeQuery(rows, count)
+        analysis = make_analysis()
+        fetched = list(
+            analysis._iter_rows(
+                supabase,
+                "messages",
+                "*",
+                [("gte", "timestamp", "2024-01-01")],
+                "timestamp",
+                "messages",
+                batch_size=10,
+                max_workers=max_workers,
+            )
+        )
+        return rows, fetched
+
+    def test_concurrent_pages_with_count(self):
+        rows, fetched = self.iter_rows(35, 35, max_workers=4)
+        self.assertEqual(fetched, rows)
+
+    def test_sequential_pages_without_count(self):
+        for row_count in (0, 5, 10, 35):
+            rows, fetched = self.iter_rows(row_count, None, max_workers=4)
+            self.assertEqual(fetched, rows, row_count)
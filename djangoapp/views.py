@@ -1,11 +1,10 @@
 from datetime import datetime
 
-from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from .filters import MessageFilter
+from .filters import LazyDjangoFilterBackend, MessageFilter
 from .models import (
     Day,
     Location,
@@ -36,7 +35,7 @@ class TimeAnalysisViewSet(viewsets.ModelViewSet):
     """
 
     queryset = TimeAnalysis.objects.all()
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [LazyDjangoFilterBackend]
     filterset_fields = ["status"]
 
     def get_serializer_class(self):
@@ -99,7 +98,7 @@ class DayViewSet(viewsets.ReadOnlyModelViewSet):
 
     queryset = Day.objects.all()
     serializer_class = DaySerializer
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [LazyDjangoFilterBackend]
     filterset_fields = ["time_analysis"]
 
     def get_queryset(self):
@@ -139,7 +138,7 @@ class MessageViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Message.objects.all()
     serializer_class = MessageSerializer
     filter_backends = [
-        DjangoFilterBackend,
+        LazyDjangoFilterBackend,
         filters.SearchFilter,
         filters.OrderingFilter,
     ]
@@ -193,7 +192,7 @@ class LocationViewSet(viewsets.ReadOnlyModelViewSet):
 
     queryset = Location.objects.all()
     serializer_class = LocationSerializer
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filter_backends = [LazyDjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ["time_analysis"]
     ordering_fields = ["visit_count", "total_time_minutes", "first_visit", "last_visit"]
     ordering = ["-visit_count"]  # Default to most visited locations first
@@ -244,7 +243,7 @@ class WebsiteAnalysisViewSet(viewsets.ReadOnlyModelViewSet):
 
     queryset = WebsiteAnalysis.objects.all()
     serializer_class = WebsiteAnalysisSerializer
-    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filter_backends = [LazyDjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ["time_analysis"]
     ordering_fields = [
         "correlation_coefficient",
@@ -325,7 +324,7 @@ class PersonAnalysisViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = PersonAnalysis.objects.all()
     serializer_class = PersonAnalysisSerializer
     filter_backends = [
-        DjangoFilterBackend,
+        LazyDjangoFilterBackend,
         filters.OrderingFilter,
         filters.SearchFilter,
     ]
@@ -410,7 +409,7 @@ class PlaceAnalysisViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = PlaceAnalysis.objects.all()
     serializer_class = PlaceAnalysisSerializer
     filter_backends = [
-        DjangoFilterBackend,
+        LazyDjangoFilterBackend,
         filters.OrderingFilter,
         filters.SearchFilter,
     ]